@@ -1,7 +1,7 @@
 """Configuration management via environment variables."""
 
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -22,10 +22,18 @@ class Settings(BaseSettings):
     mapmatch_min_conf: float = 0.7
     max_segments_per_ride: int = 50
     idempotency_ttl_hours: int = 24
+    idempotency_cache_size: int = 10000  # in-process replay cache entries
     device_bucket_rate_limit: int = 500  # per hour
     rejection_log_retention_days: int = 30
     outlier_sigma: float = 3.0
 
+    # Ingestion: ride writes are batched into one transaction per window
+    group_commit_window_ms: int = 10
+
+    # PRAGMA synchronous for API connections. NORMAL is crash-safe in WAL
+    # mode; OFF is only for throwaway databases (tests)
+    db_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+
     # Rate limiting settings (H2 security fix - enabled by default)
     rate_limit_enabled: bool = True  # CHANGED from False (security best practice)
     rate_limit_per_hour: int = 500  # Requests per hour per device_bucket
@@ -1,7 +1,20 @@
 """Database initialization and connection management."""
 
 import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from app.config import get_settings
+
+# Server-authoritative timezone for bin mapping
+IST = ZoneInfo("Asia/Kolkata")
+
+# Prepared statements kept per connection (covers every distinct SQL string
+# issued by the API handlers)
+STATEMENT_CACHE_SIZE = 256
 
 
 def init_db(db_path: str) -> None:
@@ -31,17 +44,75 @@ def init_db(db_path: str) -> None:
         bins,
     )
     conn.commit()
+
+    # Refresh planner statistics so segment (4-tuple) and segment_stats
+    # (segment_id, bin_id) lookups resolve to their unique-index probes.
+    # analysis_limit keeps startup cheap on large databases.
+    conn.execute("PRAGMA analysis_limit=1000")
+    conn.execute("ANALYZE")
+    conn.commit()
     conn.close()
 
 
-def get_connection(db_path: str) -> sqlite3.Connection:
-    """Get database connection with WAL enabled."""
-    conn = sqlite3.connect(db_path)
+def get_connection(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Get database connection with WAL enabled.
+
+    Rows come back as sqlite3.Row (index and name access without per-row
+    dict building). Hot-path statements are reused from the connection's
+    prepared-statement cache instead of being re-parsed on every execute.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=check_same_thread,
+    )
     conn.execute("PRAGMA busy_timeout=5000")
+    # Per-connection setting: init_db's value does not carry over. The
+    # default NORMAL is durable across app crashes in WAL mode and skips the
+    # per-commit fsync (db_synchronous is validated against the PRAGMA values).
+    conn.execute(f"PRAGMA synchronous={get_settings().db_synchronous}")
     conn.row_factory = sqlite3.Row
     return conn
 
 
+# Long-lived connections for short helper calls that run outside a request's
+# transaction: (thread ident, db_path) -> connection
+_thread_connections: dict[tuple[int, str], sqlite3.Connection] = {}
+_thread_connections_lock = threading.Lock()
+
+
+def get_thread_connection(db_path: str) -> sqlite3.Connection:
+    """Get the calling thread's reusable connection to db_path.
+
+    Saves the open + PRAGMA setup that get_connection pays per call. The
+    connection stays open: callers must not close it and must commit or roll
+    back before returning. Closed by close_thread_connections().
+    """
+    key = (threading.get_ident(), db_path)
+    with _thread_connections_lock:
+        conn = _thread_connections.get(key)
+        if conn is None:
+            # A thread ident can be reused after its thread exits, and
+            # shutdown closes these from another thread
+            conn = get_connection(db_path, check_same_thread=False)
+            _thread_connections[key] = conn
+    return conn
+
+
+def close_thread_connections() -> None:
+    """Close every connection handed out by get_thread_connection()."""
+    with _thread_connections_lock:
+        conns = list(_thread_connections.values())
+        _thread_connections.clear()
+    for conn in conns:
+        conn.close()
+
+
+# IST is UTC+05:30, a whole number of 15-minute bins, so every timestamp in
+# the same UTC quarter-hour lands in the same bin
+BIN_SEC = 15 * 60
+
+
 def compute_bin_id(timestamp_utc: int, is_holiday: bool = False) -> int:
     """Compute bin_id from UTC timestamp using Asia/Kolkata timezone.
 
@@ -55,12 +126,18 @@ def compute_bin_id(timestamp_utc: int, is_holiday: bool = False) -> int:
     Returns:
         bin_id (0-191)
     """
-    from datetime import datetime
-    from zoneinfo import ZoneInfo
+    return _slot_bin_id(timestamp_utc // BIN_SEC, is_holiday)
+
 
+@lru_cache(maxsize=4096)
+def _slot_bin_id(slot: int, is_holiday: bool) -> int:
+    """Compute bin_id for the UTC quarter-hour starting at slot * BIN_SEC.
+
+    Cached per slot rather than per second: rides submitted together share a
+    slot, and 4096 slots cover the 7-day ingestion window several times over.
+    """
     # Convert to Asia/Kolkata timezone
-    tz = ZoneInfo("Asia/Kolkata")
-    dt = datetime.fromtimestamp(timestamp_utc, tz=tz)
+    dt = datetime.fromtimestamp(slot * BIN_SEC, tz=IST)
 
     weekday_type = 1 if dt.weekday() >= 5 else 0  # 5=Sat, 6=Sun
 
@@ -11,7 +11,7 @@ across all API endpoints, following the format defined in docs/api.md:
 """
 
 from typing import Dict, Any, Optional
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 
 def make_error_response(
@@ -29,9 +29,10 @@ def make_error_response(
         details: Optional context-specific information (defaults to empty dict)
 
     Returns:
-        JSONResponse with standardized error format
+        JSONResponse with standardized error format (orjson-encoded, like
+        the app's default response class)
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "error": error,
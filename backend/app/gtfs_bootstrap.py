@@ -310,12 +310,16 @@ def compute_segments_and_baselines(gtfs_zip: Path, db_conn: sqlite3.Connection)
         # Get or create segment
         seg_key = (route_id, direction_id, from_stop, to_stop)
         if seg_key not in segments_cache:
+            # Upsert and read back the id in one statement (SQLite >= 3.35);
+            # the no-op update makes RETURNING fire for existing rows too
             cursor.execute(
-                "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-                seg_key,
-            )
-            cursor.execute(
-                "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
+                """
+                INSERT INTO segments (route_id, direction_id, from_stop_id, to_stop_id)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (route_id, direction_id, from_stop_id, to_stop_id)
+                DO UPDATE SET route_id = excluded.route_id
+                RETURNING segment_id
+                """,
                 seg_key,
             )
             segment_id = cursor.fetchone()[0]
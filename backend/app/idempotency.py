@@ -1,13 +1,121 @@
 """Idempotency handling for ride submissions."""
 
 import hashlib
+import hmac
 import json
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional
 
-from app.db import get_connection
+import orjson
+
+from app.db import get_thread_connection
 from app.config import get_settings
 
+# In-process cache in front of the idempotency_keys table so that replays
+# arriving within seconds short-circuit without a DB round-trip.
+# Entries are bounded by settings.idempotency_cache_size (LRU eviction).
+# Only hits are cached: other processes (and the writer's open transaction)
+# can add keys this process has not seen, so a miss always asks the table.
+IDEMPOTENCY_CACHE_TTL_SEC = 300
+
+# (db_path, key) -> (cache_expires_at, submitted_at, response_hash, body_hash)
+_idem_cache: "OrderedDict[tuple[str, str], tuple[float, int, bytes, Optional[bytes]]]" = OrderedDict()
+_idem_cache_lock = threading.Lock()
+
+
+def _cache_get(db_path: str, idempotency_key: str) -> Optional[tuple[int, bytes, Optional[bytes]]]:
+    """Return (submitted_at, response_hash, body_hash) if cached and fresh."""
+    cache_key = (db_path, idempotency_key)
+    with _idem_cache_lock:
+        entry = _idem_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _idem_cache[cache_key]
+            return None
+        _idem_cache.move_to_end(cache_key)
+        return entry[1:]
+
+
+def _cache_put(
+    db_path: str,
+    idempotency_key: str,
+    submitted_at: int,
+    response_hash: bytes,
+    body_hash: Optional[bytes],
+) -> None:
+    """Insert or refresh a cache entry, evicting the least recently used."""
+    cache_key = (db_path, idempotency_key)
+    expires_at = time.monotonic() + IDEMPOTENCY_CACHE_TTL_SEC
+    maxsize = get_settings().idempotency_cache_size
+    with _idem_cache_lock:
+        _idem_cache[cache_key] = (expires_at, submitted_at, response_hash, body_hash)
+        _idem_cache.move_to_end(cache_key)
+        while len(_idem_cache) > maxsize:
+            _idem_cache.popitem(last=False)
+
+
+def _cache_prune(min_submitted_at: int) -> None:
+    """Drop entries for keys submitted before min_submitted_at or past their cache TTL."""
+    now = time.monotonic()
+    with _idem_cache_lock:
+        stale = [
+            cache_key
+            for cache_key, entry in _idem_cache.items()
+            if entry[0] < now or entry[1] < min_submitted_at
+        ]
+        for cache_key in stale:
+            del _idem_cache[cache_key]
+
+
+def clear_idempotency_cache() -> None:
+    """Drop all in-process cache entries (keys remain in the database)."""
+    with _idem_cache_lock:
+        _idem_cache.clear()
+
+
+# Canonical form for hashing: sorted keys, compact separators, UTF-8.
+# Request and response dicts come from JSON/pydantic, so keys are always str;
+# OPT_NON_STR_KEYS would only slow serialization down (~25% here).
+_CANONICAL_OPTS = orjson.OPT_SORT_KEYS
+
+
+def _canonical_json(obj: dict) -> bytes:
+    """Serialize obj deterministically (keys sorted recursively) as UTF-8 bytes."""
+    return orjson.dumps(obj, option=_CANONICAL_OPTS)
+
+
+def compute_response_digest(response_data: dict) -> bytes:
+    """Compute the SHA256 digest of a response, as stored in idempotency_keys.
+
+    Args:
+        response_data: Response dictionary to hash
+
+    Returns:
+        SHA256 digest (32 bytes)
+    """
+    return hashlib.sha256(_canonical_json(response_data)).digest()
+
+
+def compute_body_digest(body_dict: dict) -> bytes:
+    """Compute the SHA256 digest of a request body for verification.
+
+    Uses deterministic JSON serialization (sorted keys, UTF-8) to ensure
+    identical bodies produce identical digests regardless of key ordering.
+
+    Security: Prevents replay attacks with modified payloads (H1 - STRIDE: Tampering)
+
+    Args:
+        body_dict: Request body as dictionary
+
+    Returns:
+        SHA256 digest (32 bytes)
+    """
+    return hashlib.sha256(_canonical_json(body_dict)).digest()
+
 
 def compute_response_hash(response_data: dict) -> str:
     """Compute SHA256 hash of response for verification.
@@ -18,17 +126,11 @@ def compute_response_hash(response_data: dict) -> str:
     Returns:
         SHA256 hex digest
     """
-    response_json = json.dumps(response_data, sort_keys=True)
-    return hashlib.sha256(response_json.encode()).hexdigest()
+    return compute_response_digest(response_data).hex()
 
 
 def compute_body_hash(body_dict: dict) -> str:
-    """Compute SHA256 hash of request body for verification.
-
-    Uses deterministic JSON serialization (sorted keys, UTF-8) to ensure
-    identical bodies produce identical hashes regardless of key ordering.
-
-    Security: Prevents replay attacks with modified payloads (H1 - STRIDE: Tampering)
+    """Compute SHA256 hash of request body (hex form of compute_body_digest).
 
     Args:
         body_dict: Request body as dictionary
@@ -36,11 +138,41 @@ def compute_body_hash(body_dict: dict) -> str:
     Returns:
         SHA256 hex digest (64 characters)
     """
+    return compute_body_digest(body_dict).hex()
+
+
+def _legacy_body_digest(body_dict: dict) -> bytes:
+    """Body digest as stored before the orjson canonical form (json.dumps spacing).
+
+    Keys stored by the previous release carry this hash until they expire;
+    remove once a full idempotency TTL has passed since the upgrade.
+    """
     body_json = json.dumps(body_dict, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(body_json.encode('utf-8')).hexdigest()
+    return hashlib.sha256(body_json.encode('utf-8')).digest()
+
 
+def _digest_from_db(value: "bytes | str | None") -> Optional[bytes]:
+    """Return a stored hash as bytes (a 32-byte digest for every valid row).
 
-def check_idempotency_key(idempotency_key: str, body_dict: Optional[dict] = None) -> Optional[dict]:
+    Rows written before BLOB storage hold 64-char hex TEXT and are decoded.
+    TEXT that is not hex comes back as its UTF-8 bytes, which never equals a
+    computed digest; NULL stays None.
+    """
+    if isinstance(value, str):
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            return value.encode()
+    return value
+
+
+def check_idempotency_key(
+    idempotency_key: str,
+    body_dict: Optional[dict] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    *,
+    body_digest: Optional[bytes] = None,
+) -> Optional[dict]:
     """Check if idempotency key exists and verify body hash.
 
     Security: Enforces body hash verification to prevent tampering (H1 fix)
@@ -48,32 +180,50 @@ def check_idempotency_key(idempotency_key: str, body_dict: Optional[dict] = None
     Args:
         idempotency_key: UUID provided by client
         body_dict: Request body dict (for hash verification). If None, only checks existence.
+        conn: Optional open connection (sees uncommitted keys of its transaction,
+            so rows read through it are not cached). If None, the thread's
+            reusable connection is used.
+        body_digest: compute_body_digest(body_dict), if the caller already has
+            it (e.g. hashed outside a write transaction)
 
     Returns:
         Cached response dict if key exists with:
         - "_cached": True (sentinel)
-        - "response_hash": SHA256 of cached response
-        - "body_hash": SHA256 of request body (None if not stored)
+        - "response_hash": SHA256 digest (32 bytes) of cached response
+        - "body_hash": SHA256 digest (32 bytes) of request body (None if not stored)
         - "body_hash_match": True if body_hash matches, False if mismatch, None if not verified
         Returns None if key doesn't exist or is expired.
     """
     settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
 
     # Check TTL
     ttl_seconds = settings.idempotency_ttl_hours * 3600
     min_timestamp = int(time.time()) - ttl_seconds
 
-    cursor.execute(
-        """
-        SELECT response_hash, body_hash FROM idempotency_keys
-        WHERE key = ? AND submitted_at >= ?
-        """,
-        (idempotency_key, min_timestamp),
-    )
-    row = cursor.fetchone()
-    conn.close()
+    cached = _cache_get(settings.db_path, idempotency_key)
+    if cached is not None and cached[0] >= min_timestamp:
+        row = (cached[1], cached[2])
+    else:
+        # A caller's connection may be inside an uncommitted transaction (the
+        # writer's batch); only rows read on our own connection are cached.
+        own_conn = conn is None
+        if own_conn:
+            conn = get_thread_connection(settings.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT submitted_at, response_hash, body_hash FROM idempotency_keys
+            WHERE key = ? AND submitted_at >= ?
+            """,
+            (idempotency_key, min_timestamp),
+        )
+        stored = cursor.fetchone()
+
+        row = None
+        if stored:
+            row = (_digest_from_db(stored[1]), _digest_from_db(stored[2]))
+            if own_conn:
+                _cache_put(settings.db_path, idempotency_key, stored[0], row[0], row[1])
 
     if row:
         stored_response_hash = row[0]
@@ -87,8 +237,14 @@ def check_idempotency_key(idempotency_key: str, body_dict: Optional[dict] = None
 
         # Verify body hash if provided and stored hash exists
         if body_dict is not None and stored_body_hash is not None:
-            current_body_hash = compute_body_hash(body_dict)
-            result["body_hash_match"] = (current_body_hash == stored_body_hash)
+            # Constant-time: the stored hash must not leak through timing
+            result["body_hash_match"] = (
+                hmac.compare_digest(
+                    compute_body_digest(body_dict) if body_digest is None else body_digest,
+                    stored_body_hash,
+                )
+                or hmac.compare_digest(_legacy_body_digest(body_dict), stored_body_hash)
+            )
         else:
             result["body_hash_match"] = None
 
@@ -97,7 +253,15 @@ def check_idempotency_key(idempotency_key: str, body_dict: Optional[dict] = None
     return None
 
 
-def store_idempotency_key(idempotency_key: str, body_data: dict, response_data: dict) -> None:
+def store_idempotency_key(
+    idempotency_key: str,
+    body_data: dict,
+    response_data: dict,
+    conn: Optional[sqlite3.Connection] = None,
+    *,
+    now: Optional[int] = None,
+    body_digest: Optional[bytes] = None,
+) -> None:
     """Store idempotency key with body and response hashes.
 
     Security: Stores body hash for tampering detection (H1 fix)
@@ -106,23 +270,42 @@ def store_idempotency_key(idempotency_key: str, body_data: dict, response_data:
         idempotency_key: UUID provided by client
         body_data: Request body dictionary
         response_data: Response dictionary to cache
+        conn: Optional open connection. The key is then written inside the
+            caller's transaction (not committed, not cached until it is read
+            back after commit). If None, the key is committed immediately.
+        now: submitted_at to record (Unix seconds); defaults to the current time
+        body_digest: compute_body_digest(body_data), if the caller already has it
     """
     settings = get_settings()
-    conn = get_connection(settings.db_path)
+    own_conn = conn is None
+    if own_conn:
+        conn = get_thread_connection(settings.db_path)
     cursor = conn.cursor()
 
-    body_hash = compute_body_hash(body_data)
-    response_hash = compute_response_hash(response_data)
-
-    cursor.execute(
-        """
-        INSERT OR REPLACE INTO idempotency_keys (key, submitted_at, response_hash, body_hash)
-        VALUES (?, ?, ?, ?)
-        """,
-        (idempotency_key, int(time.time()), response_hash, body_hash),
-    )
-    conn.commit()
-    conn.close()
+    body_hash = compute_body_digest(body_data) if body_digest is None else body_digest
+    response_hash = compute_response_digest(response_data)
+
+    submitted_at = int(time.time()) if now is None else now
+
+    try:
+        cursor.execute(
+            """
+            INSERT INTO idempotency_keys (key, submitted_at, response_hash, body_hash)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                submitted_at = excluded.submitted_at,
+                response_hash = excluded.response_hash,
+                body_hash = excluded.body_hash
+            """,
+            (idempotency_key, submitted_at, response_hash, body_hash),
+        )
+    except sqlite3.Error:
+        if own_conn:
+            conn.rollback()
+        raise
+    if own_conn:
+        conn.commit()
+        _cache_put(settings.db_path, idempotency_key, submitted_at, response_hash, body_hash)
 
 
 def cleanup_expired_keys() -> int:
@@ -132,17 +315,31 @@ def cleanup_expired_keys() -> int:
         Number of keys deleted
     """
     settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
+    conn = get_thread_connection(settings.db_path)
 
     ttl_seconds = settings.idempotency_ttl_hours * 3600
     min_timestamp = int(time.time()) - ttl_seconds
 
-    cursor.execute(
-        "DELETE FROM idempotency_keys WHERE submitted_at < ?", (min_timestamp,)
-    )
-    deleted_count = cursor.rowcount
-    conn.commit()
-    conn.close()
+    # Probe with a read first: a DELETE matching nothing still takes the
+    # write lock and commits an empty transaction.
+    deleted_count = 0
+    expired = conn.execute(
+        "SELECT EXISTS(SELECT 1 FROM idempotency_keys WHERE submitted_at < ?)",
+        (min_timestamp,),
+    ).fetchone()[0]
+    if expired:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            deleted_count = conn.execute(
+                "DELETE FROM idempotency_keys WHERE submitted_at < ?", (min_timestamp,)
+            ).rowcount
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    # Drop exactly the entries whose rows were just deleted, so the cache
+    # never outlives the rows it mirrors; live keys stay cached.
+    _cache_prune(min_timestamp)
 
     return deleted_count
@@ -3,7 +3,7 @@
 import logging
 import math
 import time
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 from app.config import get_settings
 
@@ -16,6 +16,10 @@ def update_welford(
 ) -> Tuple[int, float, float]:
     """Update Welford running statistics.
 
+    One division per update. The running mean is stored as-is because ETA
+    reads and the outlier check use it directly; a sum-based form such as
+    Youngs-Cramer would move that division to every read instead.
+
     Args:
         n: Current sample count
         mean: Current mean
@@ -166,89 +170,89 @@ def is_stale(last_update: Optional[int]) -> bool:
     return (int(time.time()) - last_update) > threshold_sec
 
 
-def update_device_bucket(conn, device_bucket: str) -> None:
+def update_device_bucket(conn, device_bucket: str, observations: int = 1) -> int:
     """Update or create device bucket entry.
 
+    Does not commit; the caller owns the transaction.
+
     Args:
         conn: Database connection
         device_bucket: SHA256 device bucket ID
+        observations: Number of observations to credit (one per segment)
+
+    Returns:
+        The bucket's observation_count after this update
     """
-    cursor = conn.cursor()
     now = int(time.time())
 
-    # Try to update existing bucket
-    cursor.execute(
+    # One upsert instead of UPDATE-then-INSERT; RETURNING needs SQLite >= 3.35
+    cursor = conn.execute(
         """
-        UPDATE device_buckets
-        SET last_seen = ?, observation_count = observation_count + 1
-        WHERE bucket_id = ?
+        INSERT INTO device_buckets (bucket_id, first_seen, last_seen, observation_count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(bucket_id) DO UPDATE SET
+            last_seen = excluded.last_seen,
+            observation_count = observation_count + excluded.observation_count
+        RETURNING observation_count
         """,
-        (now, device_bucket),
+        (device_bucket, now, now, observations),
     )
-
-    # If no rows updated, insert new bucket
-    if cursor.rowcount == 0:
-        cursor.execute(
-            """
-            INSERT INTO device_buckets (bucket_id, first_seen, last_seen, observation_count)
-            VALUES (?, ?, ?, 1)
-            """,
-            (device_bucket, now, now),
-        )
-
-    conn.commit()
+    return cursor.fetchone()[0]
 
 
-def log_rejection(
+def log_rejections(
     conn,
-    segment_id: int,
-    bin_id: int,
-    reason: str,
-    duration_sec: float,
-    mapmatch_conf: float,
+    rejections: Iterable[Tuple[int, int, str, float, float]],
     device_bucket: str | None = None,
 ) -> None:
-    """Log rejected observation to rejection_log table.
+    """Log rejected observations to rejection_log with a single executemany.
+
+    Does not commit; the caller owns the transaction.
 
     Args:
         conn: Database connection
-        segment_id: Segment ID
-        bin_id: Time bin ID
-        reason: Rejection reason
-        duration_sec: Observed duration
-        mapmatch_conf: Map-matching confidence
-        device_bucket: Optional device bucket ID
+        rejections: (segment_id, bin_id, reason, duration_sec, mapmatch_conf)
+            per rejected observation
+        device_bucket: Optional device bucket ID shared by the ride
     """
-    cursor = conn.cursor()
-    cursor.execute(
+    submitted_at = int(time.time())
+    conn.executemany(
         """
         INSERT INTO rejection_log (segment_id, bin_id, reason, submitted_at, device_bucket, duration_sec, mapmatch_conf)
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
-        (
-            segment_id,
-            bin_id,
-            reason,
-            int(time.time()),
-            device_bucket,
-            duration_sec,
-            mapmatch_conf,
-        ),
+        [
+            (segment_id, bin_id, reason, submitted_at, device_bucket, duration_sec, mapmatch_conf)
+            for segment_id, bin_id, reason, duration_sec, mapmatch_conf in rejections
+        ],
     )
-    conn.commit()
 
 
 def update_segment_stats(
-    conn, segment_id: int, bin_id: int, duration_sec: float, mapmatch_conf: float = 1.0
+    conn,
+    segment_id: int,
+    bin_id: int,
+    duration_sec: float,
+    mapmatch_conf: float = 1.0,
+    pending: Optional[dict] = None,
+    prefetched: Optional[dict] = None,
 ) -> tuple[bool, str | None]:
     """Update segment_stats with new observation.
 
+    Does not commit; the caller owns the transaction.
+
     Args:
         conn: Database connection
         segment_id: Segment ID
         bin_id: Time bin ID
         duration_sec: Observed duration in seconds
         mapmatch_conf: Map-matching confidence [0.0-1.0]
+        pending: Optional per-ride {(segment_id, bin_id): stats row}. When
+            given, updated rows are recorded here instead of written (flush
+            them with flush_segment_stats), and a bin already in it is not
+            re-read from the database
+        prefetched: Optional rows from prefetch_segment_stats, used instead of
+            a per-segment SELECT (a key missing from it has no stats row)
 
     Returns:
         (accepted: bool, rejection_reason: str | None)
@@ -265,16 +269,22 @@ def update_segment_stats(
         )
         return False, "low_mapmatch_conf"
 
-    # Fetch current stats (include last_update for time-based alpha)
-    cursor.execute(
-        """
-        SELECT n, welford_mean, welford_m2, ema_mean, ema_var, schedule_mean, last_update
-        FROM segment_stats
-        WHERE segment_id = ? AND bin_id = ?
-        """,
-        (segment_id, bin_id),
-    )
-    row = cursor.fetchone()
+    # Fetch current stats (include last_update for time-based alpha). The
+    # outlier gate and EMA alpha need them in Python, so this read cannot be
+    # folded into the UPDATE; a bin this ride already updated is not re-read.
+    row = pending.get((segment_id, bin_id)) if pending is not None else None
+    if row is None and prefetched is not None:
+        row = prefetched.get((segment_id, bin_id))
+    elif row is None:
+        cursor.execute(
+            """
+            SELECT n, welford_mean, welford_m2, ema_mean, ema_var, schedule_mean, last_update
+            FROM segment_stats
+            WHERE segment_id = ? AND bin_id = ?
+            """,
+            (segment_id, bin_id),
+        )
+        row = cursor.fetchone()
 
     if row is None:
         logger.warning(
@@ -301,24 +311,78 @@ def update_segment_stats(
     # Update EMA with time-based alpha (prevents stale/volatile estimates)
     alpha = compute_time_based_alpha(last_update, settings.half_life_days)
     ema_mean_new, ema_var_new = update_ema(ema_mean, ema_var, duration_sec, alpha)
+    row_new = (
+        n_new,
+        welford_mean_new,
+        welford_m2_new,
+        ema_mean_new,
+        ema_var_new,
+        schedule_mean,
+        int(time.time()),
+    )
+
+    if pending is not None:
+        # Written later, once per bin, by flush_segment_stats
+        pending[(segment_id, bin_id)] = row_new
+    else:
+        flush_segment_stats(conn, {(segment_id, bin_id): row_new})
+    return True, None
+
+
+def prefetch_segment_stats(conn, keys: Iterable[Tuple[int, int]]) -> dict:
+    """Read the segment_stats rows for many (segment_id, bin_id) keys in one query.
+
+    The keys are joined in from a VALUES list, so each is still a primary-key
+    probe (a row-value IN over VALUES would scan the table).
+
+    Args:
+        conn: Database connection
+        keys: (segment_id, bin_id) pairs; duplicates are allowed
 
-    # Write back
-    cursor.execute(
+    Returns:
+        {(segment_id, bin_id): stats row} in the shape update_segment_stats
+        reads; keys without a row are absent
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    rows = conn.execute(
+        f"""
+        WITH wanted(segment_id, bin_id) AS (VALUES {", ".join(["(?, ?)"] * len(keys))})
+        SELECT ss.segment_id, ss.bin_id, ss.n, ss.welford_mean, ss.welford_m2,
+               ss.ema_mean, ss.ema_var, ss.schedule_mean, ss.last_update
+        FROM wanted
+        JOIN segment_stats ss
+            ON ss.segment_id = wanted.segment_id AND ss.bin_id = wanted.bin_id
+        """,
+        [value for key in keys for value in key],
+    ).fetchall()
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+
+def flush_segment_stats(conn, pending: dict) -> None:
+    """Write rows collected by update_segment_stats(pending=...).
+
+    One executemany, so the UPDATE is prepared once for all bins of a ride.
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        conn: Database connection
+        pending: {(segment_id, bin_id): stats row} as built by update_segment_stats
+    """
+    rows = []
+    for (segment_id, bin_id), row in pending.items():
+        n, welford_mean, welford_m2, ema_mean, ema_var, _schedule_mean, last_update = row
+        rows.append(
+            (n, welford_mean, welford_m2, ema_mean, ema_var, last_update, segment_id, bin_id)
+        )
+
+    conn.executemany(
         """
         UPDATE segment_stats
         SET n = ?, welford_mean = ?, welford_m2 = ?, ema_mean = ?, ema_var = ?, last_update = ?
         WHERE segment_id = ? AND bin_id = ?
         """,
-        (
-            n_new,
-            welford_mean_new,
-            welford_m2_new,
-            ema_mean_new,
-            ema_var_new,
-            int(time.time()),
-            segment_id,
-            bin_id,
-        ),
+        rows,
     )
-    conn.commit()
-    return True, None
@@ -1,22 +1,24 @@
 """FastAPI application entry point."""
 
 import logging
+import ssl
 import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import get_settings
-from app.db import init_db
+from app.db import close_thread_connections, init_db
 from app import routes
 from app import state
 from app.rate_limit import RateLimitMiddleware
+from app.writer import writer
 
 logger = logging.getLogger(__name__)
 
@@ -44,14 +46,22 @@ async def lifespan(app: FastAPI):
             "Set BMTC_RATE_LIMIT_ENABLED=true for production deployment."
         )
 
+    # Idempotency hashes are hashlib.sha256, which is OpenSSL's implementation
+    # (SHA-NI accelerated where the CPU has it); log which build we got.
+    logger.info("Idempotency hashing: sha256 via %s", ssl.OPENSSL_VERSION)
+
     # Initialize database on startup
     init_db(settings.db_path)
-    state.set_startup_time(int(time.time()))
+    state.startup_time = int(time.time())
+
+    # Start the group-commit writer for ride ingestion
+    writer.start()
 
     yield
 
-    # Cleanup on shutdown (if needed)
-    pass
+    # Flush pending ride writes on shutdown
+    await writer.stop()
+    close_thread_connections()
 
 
 limiter = Limiter(key_func=get_remote_address)
@@ -60,6 +70,8 @@ app = FastAPI(
     title="BMTC Transit Learning API",
     version=get_settings().server_version,
     lifespan=lifespan,
+    # orjson encodes response bodies several times faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter state
@@ -77,12 +89,12 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     """
     if isinstance(exc.detail, dict) and "error" in exc.detail:
         # Already in structured format
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content=exc.detail
         )
     # Default FastAPI behavior for non-structured errors
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail}
     )
@@ -0,0 +1,14 @@
+-- Migration 005 Rollback: Rewrite BLOB idempotency hashes as hex TEXT
+-- Date: 2026-10-16
+-- Description: Run before starting a release that predates migration 005.
+-- That release compares stored hashes with its lowercase hexdigest(), so
+-- BLOB rows left in place would turn every retry within the TTL into a
+-- body-hash mismatch (409).
+
+UPDATE idempotency_keys
+SET response_hash = lower(hex(response_hash))
+WHERE typeof(response_hash) = 'blob';
+
+UPDATE idempotency_keys
+SET body_hash = lower(hex(body_hash))
+WHERE typeof(body_hash) = 'blob';
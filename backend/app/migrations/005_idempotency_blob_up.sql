@@ -0,0 +1,11 @@
+-- Migration 005: Store idempotency hashes as 32-byte BLOB digests
+-- Date: 2026-10-16
+-- Description: response_hash/body_hash are written as raw SHA256 digests
+-- instead of 64-char hex TEXT (half the row and index size)
+
+-- No data change is required going up:
+-- - New rows are written as BLOBs by the application
+-- - Existing hex TEXT rows are converted to digests on read and expire with
+--   the idempotency TTL (default 24 hours)
+-- - Existing databases keep the TEXT column declaration; TEXT affinity stores
+--   BLOB values unchanged, so no table rebuild is needed
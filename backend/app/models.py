@@ -111,6 +111,8 @@ class RideSummaryResponse(BaseModel):
     accepted_segments: int
     rejected_segments: int
     rejected_by_reason: dict[str, int] = Field(default_factory=dict)  # {reason: count}
+    # Bucket's observation_count after this ride (None without device_bucket)
+    device_bucket_observation_count: Optional[int] = None
 
 
 class ETAQuery(BaseModel):
@@ -2,6 +2,9 @@
 
 import logging
 import time
+from collections import Counter
+from functools import partial
+from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Header
@@ -14,13 +17,21 @@ from app.config import get_settings
 from app.db import get_connection, compute_bin_id
 from app.learning import (
     update_segment_stats,
+    flush_segment_stats,
+    prefetch_segment_stats,
     compute_blended_mean,
     compute_percentiles_robust,
     compute_variance,
-    log_rejection,
+    log_rejections,
     update_device_bucket,
+    compute_blend_weight,
 )
-from app.idempotency import check_idempotency_key, store_idempotency_key
+from app.idempotency import (
+    check_idempotency_key,
+    compute_body_digest,
+    store_idempotency_key,
+)
+from app.writer import writer
 from app.models import (
     RideSummary,
     RideSummaryResponse,
@@ -41,7 +52,7 @@ from app.models import (
     ScheduledInfo,
     PredictionInfo,
 )
-from app.state import get_startup_time
+from app import state
 
 
 logger = logging.getLogger(__name__)
@@ -56,22 +67,79 @@ async def ride_summary(
     authenticated: bool = Depends(verify_token),
     idempotency_key: str = Header(None, alias="Idempotency-Key"),
 ):
-    """Accept ride summary and update learning statistics (global aggregation)."""
+    """Accept ride summary and update learning statistics (global aggregation).
+
+    The request is validated and its body hashed here. The idempotency check
+    and every write for the ride then run as one job of the group-commit
+    writer: a single transaction shared with other concurrent submissions,
+    rolled back on its own if the job raises.
+    """
     settings = get_settings()
 
-    # Check for deprecated timestamp_utc usage and set deprecation header
-    deprecation_warning = None
-    for segment in ride.segments:
-        if segment.timestamp_utc is not None and not segment.observed_at_utc:
-            deprecation_warning = "timestamp_utc is deprecated, use observed_at_utc (ISO-8601). Will be removed in v0.3.0 (2025-11-30)"
-            break
+    # Validate max segments
+    if len(ride.segments) > settings.max_segments_per_ride:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many segments ({len(ride.segments)}), max is {settings.max_segments_per_ride}",
+        )
 
-    # Check idempotency key (optional but recommended)
+    request_body = None
+    body_digest = None
     if idempotency_key:
-        # Convert request body to dict for hash verification
+        # Convert request body to dict for hash verification. Hashing the
+        # dict keeps one canonical form (compute_body_hash) for the endpoint
+        # and direct callers; model_dump_json is no cheaper than model_dump
+        # and emits keys in declaration rather than sorted order.
         request_body = ride.model_dump()
+        body_digest = compute_body_digest(request_body)
+
+    response_data, deprecation_warning = await writer.submit(
+        settings.db_path,
+        partial(
+            _ingest_ride,
+            ride=ride,
+            idempotency_key=idempotency_key,
+            request_body=request_body,
+            body_digest=body_digest,
+        ),
+    )
 
-        cached_response = check_idempotency_key(idempotency_key, request_body)
+    response = RideSummaryResponse(**response_data)
+
+    # Add deprecation header if needed
+    if deprecation_warning:
+        # Note: FastAPI doesn't easily allow adding headers to response_model responses
+        # This will be handled in middleware or by returning Response object
+        # For now, log the warning
+        logger.warning(f"Deprecated field used: {deprecation_warning}")
+
+    return response
+
+
+def _ingest_ride(
+    conn,
+    ride: RideSummary,
+    idempotency_key: Optional[str],
+    request_body: Optional[dict],
+    body_digest: Optional[bytes],
+) -> tuple[dict, Optional[str]]:
+    """Record an already-validated ride summary on the writer's connection (no commit).
+
+    request_body and body_digest are the ride's dict and compute_body_digest
+    of it, set whenever idempotency_key is.
+
+    Returns:
+        (response_data, deprecation_warning)
+
+    Raises:
+        HTTPException: 409 idempotency conflict, 422 unknown segment (the
+            writer rolls back the ride's writes)
+    """
+    # Check idempotency key (optional but recommended)
+    if idempotency_key:
+        cached_response = check_idempotency_key(
+            idempotency_key, request_body, conn=conn, body_digest=body_digest
+        )
         if cached_response:
             # Check body hash match (H1 security fix - prevent tampering)
             body_hash_match = cached_response.get("body_hash_match")
@@ -93,24 +161,19 @@ async def ride_summary(
             # Body hash matches or not verified (backward compat) - return cached response
             logger.info(f"Idempotent replay detected: {idempotency_key}")
             # For now, return success with zero rejected count (client should cache response)
-            response = RideSummaryResponse(
-                accepted_segments=0, rejected_segments=0, rejected_by_reason={}
-            )
-            return response
-
-    # Validate max segments
-    if len(ride.segments) > settings.max_segments_per_ride:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Too many segments ({len(ride.segments)}), max is {settings.max_segments_per_ride}",
-        )
+            return {
+                "accepted_segments": 0,
+                "rejected_segments": 0,
+                "rejected_by_reason": {},
+            }, None
 
-    conn = get_connection(settings.db_path)
     cursor = conn.cursor()
 
     accepted_count = 0
     rejected_count = 0
-    rejected_by_reason: dict[str, int] = {}
+    # Deprecated timestamp_utc usage (detected in the segment loop below)
+    deprecation_warning = None
+    rejected_by_reason: Counter[str] = Counter()
 
     # Insert ride metadata
     cursor.execute(
@@ -121,35 +184,62 @@ async def ride_summary(
 
     # Extract device_bucket from top-level (not from segments)
     device_bucket = ride.device_bucket
-
-    for seq, segment in enumerate(ride.segments):
-        # Update device bucket tracking (if provided at top level)
-        if device_bucket:
-            update_device_bucket(conn, device_bucket)
-
-        # Validate segment exists
-        cursor.execute(
-            """
-            SELECT segment_id FROM segments
-            WHERE route_id = ? AND direction_id = ? AND from_stop_id = ? AND to_stop_id = ?
-            """,
-            (
-                ride.route_id,
-                ride.direction_id,
-                segment.from_stop_id,
-                segment.to_stop_id,
-            ),
+    route_id = ride.route_id
+    direction_id = ride.direction_id
+
+    # Update device bucket tracking once per ride (if provided at top level),
+    # crediting one observation per segment
+    observation_count = None
+    if device_bucket:
+        observation_count = update_device_bucket(
+            conn, device_bucket, len(ride.segments)
         )
-        row = cursor.fetchone()
-        if row is None:
-            # Unknown segment - reject with 422
-            conn.close()
-            raise HTTPException(
-                status_code=422,
-                detail=f"Unknown segment: {segment.from_stop_id} -> {segment.to_stop_id}",
+
+    # ride_segments and rejection_log rows, each written with one
+    # executemany after the loop
+    ride_segment_rows = []
+    rejection_rows = []
+
+    # segment_id per stop pair; rides often repeat a pair, so look each up once
+    segment_ids: dict[tuple[str, str], int] = {}
+    # segment_stats rows this ride has updated: a repeated bin is not re-read,
+    # and all of them are written with one executemany after the loop
+    pending_stats: dict[tuple[int, int], tuple] = {}
+
+    # Resolve every segment's segment_id and time bin first, so the stats rows
+    # of the whole ride can be read in one query
+    resolved = []
+    for segment in ride.segments:
+        from_stop_id = segment.from_stop_id
+        to_stop_id = segment.to_stop_id
+
+        segment_id = segment_ids.get((from_stop_id, to_stop_id))
+        if segment_id is None:
+            # Validate segment exists
+            cursor.execute(
+                """
+                SELECT segment_id FROM segments
+                WHERE route_id = ? AND direction_id = ? AND from_stop_id = ? AND to_stop_id = ?
+                """,
+                (route_id, direction_id, from_stop_id, to_stop_id),
             )
+            row = cursor.fetchone()
+            if row is None:
+                # Unknown segment - reject with 422
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Unknown segment: {from_stop_id} -> {to_stop_id}",
+                )
+
+            segment_id = segment_ids[(from_stop_id, to_stop_id)] = row[0]
 
-        segment_id = row[0]
+        # Check for deprecated timestamp_utc usage and set deprecation header
+        if (
+            deprecation_warning is None
+            and segment.timestamp_utc is not None
+            and not segment.observed_at_utc
+        ):
+            deprecation_warning = "timestamp_utc is deprecated, use observed_at_utc (ISO-8601). Will be removed in v0.3.0 (2025-11-30)"
 
         # Get timestamp epoch from segment (handles both ISO-8601 and deprecated epoch)
         timestamp_epoch = segment.get_timestamp_epoch()
@@ -157,74 +247,80 @@ async def ride_summary(
         # Compute time bin (with optional holiday routing)
         bin_id = compute_bin_id(timestamp_epoch, is_holiday=segment.is_holiday)
 
+        resolved.append((segment, segment_id, bin_id, timestamp_epoch))
+
+    prefetched_stats = prefetch_segment_stats(
+        conn, [(segment_id, bin_id) for _, segment_id, bin_id, _ in resolved]
+    )
+
+    for seq, (segment, segment_id, bin_id, timestamp_epoch) in enumerate(resolved):
+        # Read model fields into locals once (pydantic attribute access is not free)
+        duration_sec = segment.duration_sec
+        mapmatch_conf = segment.mapmatch_conf
+
         # Update statistics (with mapmatch_conf check)
         accepted, rejection_reason = update_segment_stats(
-            conn, segment_id, bin_id, segment.duration_sec, segment.mapmatch_conf
+            conn,
+            segment_id,
+            bin_id,
+            duration_sec,
+            mapmatch_conf,
+            pending_stats,
+            prefetched_stats,
         )
 
         if accepted:
             accepted_count += 1
         else:
             rejected_count += 1
-            rejected_by_reason[rejection_reason] = (
-                rejected_by_reason.get(rejection_reason, 0) + 1
-            )
+            rejected_by_reason[rejection_reason] += 1
 
-            # Log rejection (use top-level device_bucket)
-            log_rejection(
-                conn,
-                segment_id,
-                bin_id,
-                rejection_reason,
-                segment.duration_sec,
-                segment.mapmatch_conf,
-                device_bucket,
+            # Log rejection (logged with the top-level device_bucket)
+            rejection_rows.append(
+                (segment_id, bin_id, rejection_reason, duration_sec, mapmatch_conf)
             )
 
         # Record ride_segment (use top-level device_bucket)
-        cursor.execute(
-            """
-            INSERT INTO ride_segments (ride_id, seq, segment_id, duration_sec, dwell_sec, timestamp_utc, accepted, device_bucket, mapmatch_conf, rejection_reason)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        ride_segment_rows.append(
             (
                 ride_id,
                 seq,
                 segment_id,
-                segment.duration_sec,
+                duration_sec,
                 segment.dwell_sec,
                 timestamp_epoch,
-                int(accepted),
+                1 if accepted else 0,
                 device_bucket,
-                segment.mapmatch_conf,
+                mapmatch_conf,
                 rejection_reason,
-            ),
+            )
         )
 
-    conn.commit()
-    conn.close()
+    flush_segment_stats(conn, pending_stats)
+    cursor.executemany(
+        """
+        INSERT INTO ride_segments (ride_id, seq, segment_id, duration_sec, dwell_sec, timestamp_utc, accepted, device_bucket, mapmatch_conf, rejection_reason)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        ride_segment_rows,
+    )
+    if rejection_rows:
+        log_rejections(conn, rejection_rows, device_bucket)
 
     response_data = {
         "accepted_segments": accepted_count,
         "rejected_segments": rejected_count,
-        "rejected_by_reason": rejected_by_reason,
+        "rejected_by_reason": dict(rejected_by_reason),
+        "device_bucket_observation_count": observation_count,
     }
 
     # Store idempotency key with body hash (if provided) - H1 security fix
     if idempotency_key:
-        request_body = ride.model_dump()
-        store_idempotency_key(idempotency_key, request_body, response_data)
-
-    response = RideSummaryResponse(**response_data)
-
-    # Add deprecation header if needed
-    if deprecation_warning:
-        # Note: FastAPI doesn't easily allow adding headers to response_model responses
-        # This will be handled in middleware or by returning Response object
-        # For now, log the warning
-        logger.warning(f"Deprecated field used: {deprecation_warning}")
+        store_idempotency_key(
+            idempotency_key, request_body, response_data, conn=conn, body_digest=body_digest
+        )
 
-    return response
+    return response_data, deprecation_warning
 
 
 def _compute_confidence(n: int) -> str:
@@ -247,8 +343,6 @@ async def get_eta(
     timestamp_utc: Optional[int] = Query(None),  # DEPRECATED: use 'when' instead
 ):
     """Query learned ETA for a segment."""
-    from datetime import datetime, timezone as dt_timezone
-
     settings = get_settings()
 
     # Validate direction_id (must be 0 or 1)
@@ -347,9 +441,6 @@ async def get_eta(
     )
 
     # Blend weight
-    from app.learning import compute_blend_weight
-    from datetime import datetime, timezone
-
     blend_weight = compute_blend_weight(n)
 
     # Convert last_update from epoch to ISO-8601 UTC string
@@ -452,7 +543,7 @@ async def health_check():
         logger.error(f"Health check DB error: {e}")
 
     # Compute uptime
-    startup = get_startup_time()
+    startup = state.startup_time
     uptime_sec = int(time.time()) - startup if startup else 0
 
     status = "ok" if db_ok else "degraded"
@@ -635,8 +726,6 @@ async def get_stop_schedule(
     route_id: Optional[str] = Query(None),
 ):
     """Get scheduled departures for a stop from GTFS."""
-    from datetime import datetime, timezone
-
     settings = get_settings()
 
     # Validate time_window_minutes manually for proper error response
@@ -206,8 +206,8 @@ CREATE INDEX IF NOT EXISTS idx_ride_segments_device_bucket ON ride_segments(devi
 CREATE TABLE IF NOT EXISTS idempotency_keys (
     key TEXT PRIMARY KEY,                -- UUID provided by client
     submitted_at INTEGER NOT NULL,       -- Unix timestamp
-    response_hash TEXT NOT NULL,         -- SHA256 of response for verification
-    body_hash TEXT                       -- SHA256 of request body (H1 security fix)
+    response_hash BLOB NOT NULL,         -- SHA256 of response (32-byte digest; hex TEXT in older rows)
+    body_hash BLOB                       -- SHA256 of request body (H1 security fix; same encoding)
 );
 
 CREATE INDEX IF NOT EXISTS idx_idempotency_submitted ON idempotency_keys(submitted_at);
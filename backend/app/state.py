@@ -1,15 +1,7 @@
 """Application state management."""
 
-# Global startup time for uptime calculation
-startup_time = None
+from typing import Optional
 
-
-def set_startup_time(timestamp: int) -> None:
-    """Set application startup timestamp."""
-    global startup_time
-    startup_time = timestamp
-
-
-def get_startup_time() -> int:
-    """Get application startup timestamp."""
-    return startup_time
+# Global startup time for uptime calculation.
+# Assigned once in the app lifespan; read directly as ``state.startup_time``.
+startup_time: Optional[int] = None
@@ -0,0 +1,180 @@
+"""Group-commit writer for ride ingestion.
+
+SQLite in WAL mode allows many readers but a single writer, and every COMMIT
+pays for a WAL sync. Instead of committing once per POST, handlers enqueue a
+write job and await its future; a single background task drains the queue
+every few milliseconds and applies all pending jobs inside one
+``BEGIN IMMEDIATE ... COMMIT`` transaction.
+
+Each job runs inside its own SAVEPOINT, so a job that raises (e.g. unknown
+segment -> 422) is rolled back without affecting the rest of the batch, and
+its exception is re-raised in the awaiting handler.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+from app.config import get_settings
+from app.db import get_thread_connection
+
+logger = logging.getLogger(__name__)
+
+# A write job receives the batch connection and returns the handler's result
+WriteJob = Callable[[Any], Any]
+
+
+class GroupCommitWriter:
+    """Single background writer that batches jobs into shared transactions."""
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        """True while the background writer task is accepting jobs."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop.
+
+        No-op if it is already running (possibly on another loop, when a second
+        app instance shares the process; that instance then writes inline).
+        """
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush pending jobs and stop the writer task started on this loop."""
+        if not self.running or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+        self._loop = None
+
+    async def submit(self, db_path: str, job: WriteJob) -> Any:
+        """Run ``job(conn)`` in the next group commit and return its result.
+
+        Falls back to a dedicated single-job transaction when the writer is not
+        running on this event loop (e.g. app used without its lifespan, or a
+        second app instance/loop in the same process).
+        """
+        if not self.running or self._loop is not asyncio.get_running_loop():
+            # Still off the event loop: the transaction blocks on SQLite locks
+            result, exc = (await asyncio.to_thread(write_batch, db_path, [job]))[0]
+            if exc is not None:
+                raise exc
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((db_path, job, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until the stop sentinel is received.
+
+        However the task ends, jobs still queued or taken but not yet resolved
+        fail with a RuntimeError instead of leaving their handlers waiting.
+        """
+        batch: list = []
+        try:
+            stopping = False
+            while not stopping:
+                item = await self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+
+                # Let concurrent writers pile up behind the first job
+                window_ms = get_settings().group_commit_window_ms
+                if window_ms > 0:
+                    await asyncio.sleep(window_ms / 1000)
+
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                by_db: dict[str, list] = defaultdict(list)
+                for db_path, job, future in batch:
+                    by_db[db_path].append((job, future))
+
+                for db_path, entries in by_db.items():
+                    jobs = [job for job, _ in entries]
+                    try:
+                        outcomes = await asyncio.to_thread(write_batch, db_path, jobs)
+                    except Exception as e:
+                        logger.error(f"Group commit failed ({len(jobs)} jobs): {e}")
+                        outcomes = [(None, e)] * len(jobs)
+
+                    for (_, future), (result, exc) in zip(entries, outcomes):
+                        if future.done():  # e.g. cancelled by its handler
+                            continue
+                        if exc is not None:
+                            future.set_exception(exc)
+                        else:
+                            future.set_result(result)
+                batch = []
+        except Exception:
+            logger.exception("Group-commit writer stopped unexpectedly")
+        finally:
+            self._fail_pending(batch)
+
+    def _fail_pending(self, batch: list) -> None:
+        """Fail the unresolved futures of batch and of every job left in the queue."""
+        pending = list(batch)
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                pending.append(item)
+
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError("Group-commit writer stopped before writing the job")
+                )
+
+
+def write_batch(db_path: str, jobs: list[WriteJob]) -> list[tuple[Any, Optional[BaseException]]]:
+    """Apply jobs in one transaction, isolating each in a SAVEPOINT.
+
+    Returns:
+        One (result, exception) pair per job, in order. If the final COMMIT
+        fails, every job reports that error.
+    """
+    # The worker thread's long-lived connection keeps its prepared statements
+    # (STATEMENT_CACHE_SIZE) warm from one batch to the next
+    conn = get_thread_connection(db_path)
+    outcomes: list[tuple[Any, Optional[BaseException]]] = []
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for job in jobs:
+            conn.execute("SAVEPOINT ride_job")
+            try:
+                result = job(conn)
+            except Exception as e:
+                conn.execute("ROLLBACK TO ride_job")
+                conn.execute("RELEASE ride_job")
+                outcomes.append((None, e))
+            else:
+                conn.execute("RELEASE ride_job")
+                outcomes.append((result, None))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return [(None, e)] * len(jobs)
+    return outcomes
+
+
+# Process-wide writer, started and stopped by the app lifespan
+writer = GroupCommitWriter()
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """Generate sample ride data for testing."""
 
-import random
 import time
 import json
 
+import numpy as np
+
 
 def generate_sample_rides(num_rides: int = 100):
-    """Generate synthetic rides across 5 routes."""
+    """Generate synthetic rides across 5 routes.
+
+    All random draws are vectorized with NumPy (one call per field for the
+    whole batch); Python objects are only built once, when assembling dicts.
+    """
     routes = [
         (
             "ROUTE_335E",
@@ -19,46 +24,62 @@ def generate_sample_rides(num_rides: int = 100):
         ("ROUTE_600", ["STOP_WHITEFIELD", "STOP_MARATHAHALLI", "STOP_KORAMANGALA"]),
     ]
 
-    rides = []
+    rng = np.random.default_rng()
     now = int(time.time())
+    stop_counts = np.array([len(stops) for _, stops in routes])
+
+    # Per-ride draws
+    route_idx = rng.integers(0, len(routes), size=num_rides)
+    direction_ids = rng.integers(0, 2, size=num_rides)
+    ride_stop_counts = stop_counts[route_idx]
+
+    # Generate 2-4 segments per ride
+    num_segments = rng.integers(2, np.minimum(4, ride_stop_counts - 1) + 1)
+    start_idx = rng.integers(0, ride_stop_counts - num_segments)
+    base_times = now - rng.integers(0, 7 * 24 * 3600, endpoint=True, size=num_rides)  # Within last 7 days
+
+    # Per-segment draws
+    total_segments = int(num_segments.sum())
+    # Typical inter-stop time: 3-10 min
+    durations = rng.uniform(180, 600, size=total_segments).round(1).tolist()
+    # Dwell time: 10-60 sec
+    dwells = rng.uniform(10, 60, size=total_segments).round(1).tolist()
+
+    # Position of each segment within its ride, used for stop index and 5-min spacing
+    ride_offsets = np.cumsum(num_segments) - num_segments
+    seg_pos = np.arange(total_segments) - np.repeat(ride_offsets, num_segments)
+    timestamps = (np.repeat(base_times, num_segments) + seg_pos * 300).tolist()
+
+    rides = []
+    route_idx = route_idx.tolist()
+    direction_ids = direction_ids.tolist()
+    num_segments = num_segments.tolist()
+    start_idx = start_idx.tolist()
+    ride_offsets = ride_offsets.tolist()
 
     for i in range(num_rides):
-        route_id, stops = random.choice(routes)
-        direction_id = random.choice([0, 1])
-
-        # Generate 2-4 segments per ride
-        num_segments = random.randint(2, min(4, len(stops) - 1))
-        start_idx = random.randint(0, len(stops) - num_segments - 1)
-
-        segments = []
-        base_time = now - random.randint(0, 7 * 24 * 3600)  # Within last 7 days
-
-        for j in range(num_segments):
-            from_stop = stops[start_idx + j]
-            to_stop = stops[start_idx + j + 1]
-
-            # Typical inter-stop time: 3-10 min
-            duration_sec = random.uniform(180, 600)
-
-            # Dwell time: 10-60 sec
-            dwell_sec = random.uniform(10, 60)
-
-            segments.append(
-                {
-                    "from_stop_id": from_stop,
-                    "to_stop_id": to_stop,
-                    "duration_sec": round(duration_sec, 1),
-                    "dwell_sec": round(dwell_sec, 1),
-                    "timestamp_utc": base_time + j * 300,  # 5 min apart
-                }
-            )
-
-        ride = {
-            "route_id": route_id,
-            "direction_id": direction_id,
-            "segments": segments,
-        }
-        rides.append(ride)
+        route_id, stops = routes[route_idx[i]]
+        offset = ride_offsets[i]
+        first_stop = start_idx[i]
+
+        segments = [
+            {
+                "from_stop_id": stops[first_stop + j],
+                "to_stop_id": stops[first_stop + j + 1],
+                "duration_sec": durations[offset + j],
+                "dwell_sec": dwells[offset + j],
+                "timestamp_utc": timestamps[offset + j],  # 5 min apart
+            }
+            for j in range(num_segments[i])
+        ]
+
+        rides.append(
+            {
+                "route_id": route_id,
+                "direction_id": direction_ids[i],
+                "segments": segments,
+            }
+        )
 
     return rides
 
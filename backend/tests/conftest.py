@@ -3,8 +3,10 @@
 import os
 import sqlite3
 import tempfile
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Generator
+from types import MappingProxyType
+from typing import Generator, Mapping
 
 import pytest
 from fastapi.testclient import TestClient
@@ -15,23 +17,63 @@ from fastapi.testclient import TestClient
 # ==============================================================================
 
 
+def _settings_env_fingerprint() -> tuple[tuple[str, str], ...]:
+    """Snapshot the BMTC_* environment variables that Settings reads."""
+    return tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("BMTC_")))
+
+
+# Environment fingerprint the cached Settings may have been built from
+# (None = unknown, clear before the next test)
+_settings_cache_env: list = [None]
+
+
 @pytest.fixture(autouse=True)
-def clear_settings_cache():
-    """Clear settings cache before and after each test for complete isolation.
+def clear_settings_cache(request):
+    """Clear settings cache around each test when the environment may differ.
 
     This fixture runs automatically for ALL tests to prevent settings cache
     contamination between tests, which was causing the test suite to fail
     when run together.
+
+    Clearing forces pydantic to re-read and re-validate every variable, so
+    it is skipped when nothing changed: before the test the cache is cleared
+    only if the BMTC_* environment differs from the one recorded after the
+    last clear (e.g. a new module's module_env), and after the test only if
+    the test could have changed it (it used monkeypatch, or the environment
+    differs from its start).
     """
     from app.config import get_settings
 
+    fingerprint = _settings_env_fingerprint()
+
     # Clear cache before test
-    get_settings.cache_clear()
+    if fingerprint != _settings_cache_env[0]:
+        get_settings.cache_clear()
+        _settings_cache_env[0] = fingerprint
 
     yield
 
     # Clear cache after test
-    get_settings.cache_clear()
+    if "monkeypatch" in request.fixturenames or _settings_env_fingerprint() != fingerprint:
+        get_settings.cache_clear()
+        _settings_cache_env[0] = None
+
+
+# Test environment shared by the function- and module-scoped env fixtures
+TEST_ENV_VARS = {
+    "BMTC_API_KEY": "test-key-isolated-12345678901234567890",
+    "BMTC_GTFS_PATH": "/tmp/gtfs",
+    "BMTC_N0": "20",
+    "BMTC_EMA_ALPHA": "0.1",
+    "BMTC_HALF_LIFE_DAYS": "30",
+    "BMTC_OUTLIER_SIGMA": "3.0",
+    "BMTC_MAPMATCH_MIN_CONF": "0.7",
+    "BMTC_MAX_SEGMENTS_PER_RIDE": "50",
+    "BMTC_IDEMPOTENCY_TTL_HOURS": "24",
+    "BMTC_RATE_LIMIT_ENABLED": "false",  # Disabled by default for faster tests
+    "BMTC_RATE_LIMIT_PER_HOUR": "500",
+    "BMTC_DB_SYNCHRONOUS": "OFF",  # Test databases are thrown away; skip fsyncs
+}
 
 
 @pytest.fixture
@@ -41,19 +83,7 @@ def test_env(monkeypatch) -> dict[str, str]:
     Returns a dict of test environment variables that were set.
     Tests can override specific values after using this fixture.
     """
-    env_vars = {
-        "BMTC_API_KEY": "test-key-isolated-12345678901234567890",
-        "BMTC_GTFS_PATH": "/tmp/gtfs",
-        "BMTC_N0": "20",
-        "BMTC_EMA_ALPHA": "0.1",
-        "BMTC_HALF_LIFE_DAYS": "30",
-        "BMTC_OUTLIER_SIGMA": "3.0",
-        "BMTC_MAPMATCH_MIN_CONF": "0.7",
-        "BMTC_MAX_SEGMENTS_PER_RIDE": "50",
-        "BMTC_IDEMPOTENCY_TTL_HOURS": "24",
-        "BMTC_RATE_LIMIT_ENABLED": "false",  # Disabled by default for faster tests
-        "BMTC_RATE_LIMIT_PER_HOUR": "500",
-    }
+    env_vars = dict(TEST_ENV_VARS)
 
     for key, value in env_vars.items():
         monkeypatch.setenv(key, value)
@@ -61,6 +91,27 @@ def test_env(monkeypatch) -> dict[str, str]:
     return env_vars
 
 
+@pytest.fixture(scope="module")
+def module_monkeypatch() -> Generator[pytest.MonkeyPatch, None, None]:
+    """Provide a MonkeyPatch that is undone when the test module finishes.
+
+    Module-scoped fixtures cannot use the function-scoped `monkeypatch`.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+@pytest.fixture(scope="module")
+def module_env(module_monkeypatch) -> dict[str, str]:
+    """Provide the test environment for the lifetime of a test module."""
+    env_vars = dict(TEST_ENV_VARS)
+
+    for key, value in env_vars.items():
+        module_monkeypatch.setenv(key, value)
+
+    return env_vars
+
+
 @pytest.fixture
 def test_settings(test_env):
     """Provide fresh Settings instance with test environment variables.
@@ -87,8 +138,48 @@ def test_settings(test_env):
 # ==============================================================================
 
 
+@pytest.fixture(scope="session")
+def schema_template() -> Generator[sqlite3.Connection, None, None]:
+    """Provide an in-memory database with the schema loaded once per session.
+
+    Per-test databases are page-copied from it with the backup API instead
+    of re-parsing and executing schema.sql for every test. Under xdist each
+    worker process builds its own template.
+    """
+    conn = sqlite3.connect(":memory:")
+
+    schema_path = Path(__file__).parent.parent / "app" / "schema.sql"
+    with open(schema_path) as f:
+        conn.executescript(f.read())
+
+    yield conn
+
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def initialized_template(schema_template) -> Generator[sqlite3.Connection, None, None]:
+    """Provide an in-memory copy of a database prepared by init_db, once per session.
+
+    `client` page-copies it into each per-test database instead of running
+    init_db (schema, 192 time bins, ANALYZE) for every test.
+    """
+    from app.db import init_db
+
+    db_path, conn = _create_temp_db(schema_template)
+    init_db(db_path)
+
+    template = sqlite3.connect(":memory:")
+    conn.backup(template)
+    _remove_temp_db(db_path, conn)
+
+    yield template
+
+    template.close()
+
+
 @pytest.fixture
-def in_memory_db() -> Generator[sqlite3.Connection, None, None]:
+def in_memory_db(schema_template) -> Generator[sqlite3.Connection, None, None]:
     """Provide in-memory SQLite database for unit tests.
 
     This is the fastest database option and should be used for:
@@ -102,9 +193,7 @@ def in_memory_db() -> Generator[sqlite3.Connection, None, None]:
     conn.execute("PRAGMA foreign_keys = ON")
 
     # Load schema
-    schema_path = Path(__file__).parent.parent / "app" / "schema.sql"
-    with open(schema_path) as f:
-        conn.executescript(f.read())
+    schema_template.backup(conn)
 
     yield conn
 
@@ -112,12 +201,12 @@ def in_memory_db() -> Generator[sqlite3.Connection, None, None]:
 
 
 @pytest.fixture
-def temp_db(test_env, monkeypatch) -> Generator[tuple[str, sqlite3.Connection], None, None]:
+def temp_db(test_env, monkeypatch, schema_template) -> Generator[tuple[str, sqlite3.Connection], None, None]:
     """Provide temporary file-based database for integration tests.
 
     This fixture:
     1. Creates a temp file database
-    2. Loads the full schema
+    2. Copies in the full schema from the session's schema_template
     3. Updates BMTC_DB_PATH environment variable
     4. Returns both the path and connection
     5. Cleans up the file after the test
@@ -127,25 +216,80 @@ def temp_db(test_env, monkeypatch) -> Generator[tuple[str, sqlite3.Connection],
     - Tests that need FastAPI TestClient
     - Tests that verify database persistence
     """
-    # Create temp file
-    fd, db_path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)  # Close file descriptor, sqlite will open it
+    db_path, conn = _create_temp_db(schema_template)
 
     # Set environment variable for app to use
     monkeypatch.setenv("BMTC_DB_PATH", db_path)
 
-    # Create connection and load schema
+    yield db_path, conn
+
+    _remove_temp_db(db_path, conn)
+
+
+@pytest.fixture(scope="module")
+def module_db(module_env, module_monkeypatch, schema_template) -> Generator[tuple[str, sqlite3.Connection], None, None]:
+    """Provide a temporary file-based database shared by one test module.
+
+    Same setup as temp_db, but created once per module. Use this only for
+    read-mostly modules whose tests do not depend on each other's writes.
+    """
+    db_path, conn = _create_temp_db(schema_template)
+
+    # Set environment variable for app to use
+    module_monkeypatch.setenv("BMTC_DB_PATH", db_path)
+
+    yield db_path, conn
+
+    _remove_temp_db(db_path, conn)
+
+
+# Test databases are thrown away, so trade durability for fewer fsyncs.
+# locking_mode=EXCLUSIVE is deliberately absent: the app opens its own
+# connections to the same file.
+TEST_DB_PRAGMAS = (
+    "journal_mode = WAL",
+    "synchronous = OFF",
+    "temp_store = MEMORY",
+    "cache_size = -64000",
+)
+
+
+# Put test databases on tmpfs where the host has one. A real file (rather than
+# a shared-cache :memory: URI) keeps WAL and the app's separate connections
+# working, while page writes never reach a disk.
+TEST_DB_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _xdist_worker() -> str:
+    """Return the pytest-xdist worker id (gw0, gw1, ...) or "main" when not distributed."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def _create_temp_db(template: sqlite3.Connection) -> tuple[str, sqlite3.Connection]:
+    """Create a temp file database with the full schema copied from template."""
+    # Create temp file, named after the xdist worker that owns it
+    fd, db_path = tempfile.mkstemp(
+        prefix=f"bmtc-test-{_xdist_worker()}-", suffix=".db", dir=TEST_DB_DIR
+    )
+    os.close(fd)  # Close file descriptor, sqlite will open it
+
+    # Create connection and copy schema pages (stays in WAL mode)
     conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA foreign_keys = ON")
-    conn.execute("PRAGMA journal_mode = WAL")
+    for pragma in TEST_DB_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
 
-    schema_path = Path(__file__).parent.parent / "app" / "schema.sql"
-    with open(schema_path) as f:
-        conn.executescript(f.read())
+    template.backup(conn)
 
-    yield db_path, conn
+    return db_path, conn
+
+
+def _remove_temp_db(db_path: str, conn: sqlite3.Connection) -> None:
+    """Close the fixture connection and delete the temp database file."""
+    from app.db import close_thread_connections
 
-    # Cleanup
+    # Drop the app's reused connections too, so none outlives the file
+    close_thread_connections()
     conn.close()
     try:
         os.unlink(db_path)
@@ -166,32 +310,7 @@ def db_with_test_segment(temp_db) -> Generator[tuple[str, sqlite3.Connection, in
     Use this for tests that need a valid segment to work with.
     """
     db_path, conn = temp_db
-    cursor = conn.cursor()
-
-    # Insert test segment
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    conn.commit()
-
-    # Get segment_id
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
-
-    # Insert baseline stats for all 192 bins
-    for bin_id in range(192):
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean, n, welford_mean, welford_m2)
-            VALUES (?, ?, 300.0, 0, 0.0, 0.0)
-            """,
-            (segment_id, bin_id),
-        )
-    conn.commit()
+    segment_id = _seed_test_segment(conn)
 
     yield db_path, conn, segment_id
 
@@ -203,44 +322,266 @@ def db_with_test_segment(temp_db) -> Generator[tuple[str, sqlite3.Connection, in
 # ==============================================================================
 
 
+@pytest.fixture(scope="session")
+def fastapi_app():
+    """Provide the FastAPI application object (imported once per session).
+
+    app.main reads settings at import time, so the import runs under the
+    test environment.
+    """
+    from app.config import get_settings
+
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in TEST_ENV_VARS.items():
+            mp.setenv(key, value)
+        get_settings.cache_clear()
+
+        from app.main import app
+
+    get_settings.cache_clear()
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def session_client(fastapi_app, schema_template) -> Generator[TestClient, None, None]:
+    """Provide one FastAPI TestClient (one app lifespan) per session.
+
+    Building the client runs the app lifespan (DB init, writer startup);
+    doing that once per session (per xdist worker) keeps it off the per-test
+    and per-module path. The test environment is applied only while the
+    lifespan starts up: the app reads its settings per request, so tests
+    point it at their own database or environment.
+    """
+    from app.config import get_settings
+
+    with ExitStack() as stack:
+        with pytest.MonkeyPatch.context() as mp:
+            for key, value in TEST_ENV_VARS.items():
+                mp.setenv(key, value)
+            db_path, conn = _create_temp_db(schema_template)
+            stack.callback(_remove_temp_db, db_path, conn)
+            mp.setenv("BMTC_DB_PATH", db_path)
+
+            # Clear settings cache to pick up test environment
+            get_settings.cache_clear()
+
+            # Create test client (lifespan will init the session DB)
+            test_client = stack.enter_context(TestClient(fastapi_app))
+
+        # Clear cache once the startup environment is undone
+        get_settings.cache_clear()
+
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def module_client(module_db, session_client) -> TestClient:
+    """Provide the session's TestClient pointed at the module database.
+
+    The module database is initialized here the same way the lifespan
+    initializes the production database (schema, time bins, ANALYZE).
+    """
+    from app.config import get_settings
+    from app.db import init_db
+
+    db_path, _ = module_db
+
+    # Clear settings cache to pick up the module environment
+    get_settings.cache_clear()
+
+    init_db(db_path)
+
+    return session_client
+
+
 @pytest.fixture
-def client(temp_db, test_settings) -> Generator[TestClient, None, None]:
+def client(temp_db, test_settings, initialized_template, module_client) -> Generator[TestClient, None, None]:
     """Provide FastAPI TestClient with isolated database and settings.
 
     This is the main fixture for integration tests. It provides:
-    - Fresh TestClient instance
-    - Isolated temp database
+    - The session's shared TestClient (app started once per session)
+    - Isolated temp database per test
     - Test settings loaded
     - Settings cache cleared before and after
 
-    The client automatically handles:
-    - App startup/shutdown
-    - Database initialization (via lifespan)
-    - Middleware loading
+    The per-test database gets the same contents the lifespan's init_db
+    would give it (schema, time bins, ANALYZE statistics), page-copied
+    from initialized_template.
 
     Use this for testing API endpoints.
     """
-    from app.main import app
     from app.config import get_settings
 
+    _, conn = temp_db
+
     # Clear settings cache to pick up test environment
     get_settings.cache_clear()
 
-    # Create test client (lifespan will init DB)
-    with TestClient(app) as test_client:
-        yield test_client
+    initialized_template.backup(conn)
+
+    yield module_client
 
     # Clear cache after test
     get_settings.cache_clear()
 
 
 @pytest.fixture
-def auth_headers(test_settings) -> dict[str, str]:
+def post_concurrently(monkeypatch):
+    """Provide a function that POSTs requests at once through the queued writer.
+
+    The returned function takes (path, json body, headers) tuples and returns
+    the responses in order. It runs them on a fresh event loop, so it starts a
+    GroupCommitWriter on that loop and swaps it in for the app's writer: ride
+    submissions then take the production group-commit path instead of the
+    inline fallback. The commit window is widened so that requests arriving
+    together share one batch.
+    """
+    import asyncio
+
+    import httpx
+
+    import app.routes
+    from app.config import get_settings
+    from app.main import app as fastapi_app
+    from app.writer import GroupCommitWriter
+
+    def post_all(requests: list[tuple[str, dict, dict]]) -> list[httpx.Response]:
+        monkeypatch.setattr(get_settings(), "group_commit_window_ms", 50)
+
+        async def run():
+            writer = GroupCommitWriter()
+            writer.start()
+            monkeypatch.setattr(app.routes, "writer", writer)
+            try:
+                transport = httpx.ASGITransport(app=fastapi_app)
+                async with httpx.AsyncClient(
+                    transport=transport, base_url="http://testserver"
+                ) as ac:
+                    return await asyncio.gather(
+                        *(ac.post(path, json=body, headers=headers) for path, body, headers in requests)
+                    )
+            finally:
+                await writer.stop()
+
+        return asyncio.run(run())
+
+    return post_all
+
+
+def _get_or_create_segment(
+    conn: sqlite3.Connection,
+    route_id: str,
+    direction_id: int,
+    from_stop_id: str,
+    to_stop_id: str,
+) -> int:
+    """Insert a segment unless it exists and return its segment_id (no commit)."""
+    key = (route_id, direction_id, from_stop_id, to_stop_id)
+    conn.execute(
+        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) "
+        "VALUES (?, ?, ?, ?)",
+        key,
+    )
+    return conn.execute(
+        "SELECT segment_id FROM segments "
+        "WHERE route_id = ? AND direction_id = ? AND from_stop_id = ? AND to_stop_id = ?",
+        key,
+    ).fetchone()[0]
+
+
+@pytest.fixture(scope="session")
+def get_or_create_segment():
+    """Provide the segment get-or-create helper for modules that seed their own segments.
+
+    Call as get_or_create_segment(conn, route_id, direction_id, from_stop_id,
+    to_stop_id); returns the segment_id and leaves committing to the caller.
+    """
+    return _get_or_create_segment
+
+
+def _seed_test_segment(conn: sqlite3.Connection) -> int:
+    """Seed ROUTE1 (direction 0, STOP_A -> STOP_B) and its 192 baseline bins.
+
+    Runs in a single transaction: the segment get-or-create and one
+    multi-row INSERT of segment_stats (schedule_mean=300.0). Idempotent.
+
+    Returns: segment_id
+    """
+    cursor = conn.cursor()
+
+    conn.execute("BEGIN IMMEDIATE")
+    segment_id = _get_or_create_segment(conn, "ROUTE1", 0, "STOP_A", "STOP_B")
+    # One multi-row INSERT for all 192 bins (576 parameters, under SQLite's 999 limit)
+    cursor.execute(
+        "INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean) VALUES "
+        + ", ".join(["(?, ?, ?)"] * 192),
+        [value for bin_id in range(192) for value in (segment_id, bin_id, 300.0)],  # 5 min schedule baseline
+    )
+    conn.commit()
+
+    return segment_id
+
+
+@pytest.fixture
+def seeded_segment(client) -> int:
+    """Seed the canonical test segment into the client's database.
+
+    Scoped like `client`: the client's database lives for one test, so the
+    seed is applied once per database rather than once per session.
+
+    Returns: segment_id
+    """
+    from app.config import get_settings
+    from app.db import get_connection
+
+    conn = get_connection(get_settings().db_path)
+    segment_id = _seed_test_segment(conn)
+    conn.close()
+
+    return segment_id
+
+
+@pytest.fixture(scope="module")
+def module_seeded_segment(module_db, module_client) -> int:
+    """Seed the canonical test segment once into the module database.
+
+    For read-only modules on module_client. Seeds through module_db's own
+    connection rather than opening another; that connection enforces
+    foreign keys, so the GTFS route and stops the segment points at are
+    seeded too. Time bins come from module_client's init_db.
+
+    Returns: segment_id
+    """
+    _, conn = module_db
+
+    # GTFS rows referenced by the segment (idempotent)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(
+        "INSERT OR IGNORE INTO routes (route_id, route_short_name, route_type) VALUES (?, ?, ?)",
+        ("ROUTE1", "1", 3),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO stops (stop_id, stop_name, stop_lat, stop_lon) VALUES (?, ?, ?, ?)",
+        [("STOP_A", "Stop A", 12.97, 77.59), ("STOP_B", "Stop B", 12.98, 77.60)],
+    )
+    conn.commit()
+
+    return _seed_test_segment(conn)
+
+
+# Bearer token for the API key every test environment sets
+AUTH_HEADERS = MappingProxyType({"Authorization": f"Bearer {TEST_ENV_VARS['BMTC_API_KEY']}"})
+
+
+@pytest.fixture(scope="session")
+def auth_headers() -> Mapping[str, str]:
     """Provide authentication headers for protected endpoints.
 
-    Returns headers dict with valid Bearer token from test settings.
+    The test API key is fixed in TEST_ENV_VARS, so one read-only mapping is
+    shared by the whole session; spread it into a new dict to add headers.
     """
-    return {"Authorization": f"Bearer {test_settings.api_key}"}
+    return AUTH_HEADERS
 
 
 @pytest.fixture
@@ -314,8 +655,8 @@ def sample_ride_data():
 # ==============================================================================
 
 
-@pytest.fixture
-def db_with_test_routes(temp_db) -> Generator[tuple[str, sqlite3.Connection], None, None]:
+@pytest.fixture(scope="module")
+def db_with_test_routes(module_db) -> Generator[tuple[str, sqlite3.Connection], None, None]:
     """Provide database with sample GTFS routes for route search tests.
 
     This fixture adds test routes that match the patterns expected by route search tests:
@@ -323,11 +664,16 @@ def db_with_test_routes(temp_db) -> Generator[tuple[str, sqlite3.Connection], No
     - Routes with "Kengeri" and "HAL" in long names
     - Various numeric prefixes (1, 13, 335, etc.)
 
+    Module-scoped: the routes are read-only for the tests that use them, so
+    the seed is written once per module in a single transaction.
+
     Use this for testing GTFS route discovery endpoints.
     """
-    db_path, conn = temp_db
+    db_path, conn = module_db
     cursor = conn.cursor()
 
+    conn.execute("BEGIN IMMEDIATE")
+
     # Insert test agency
     cursor.execute(
         "INSERT OR IGNORE INTO agency (agency_id, agency_name, agency_url, agency_timezone) VALUES (?, ?, ?, ?)",
@@ -357,41 +703,116 @@ def db_with_test_routes(temp_db) -> Generator[tuple[str, sqlite3.Connection], No
         ("7001", "700", "Yelahanka to Bannerghatta", 3, "BMTC"),
     ]
 
-    cursor.executemany(
-        "INSERT OR IGNORE INTO routes (route_id, route_short_name, route_long_name, route_type, agency_id) VALUES (?, ?, ?, ?, ?)",
-        test_routes
+    # One multi-row INSERT (a single statement) instead of one per route
+    cursor.execute(
+        "INSERT OR IGNORE INTO routes (route_id, route_short_name, route_long_name, route_type, agency_id) VALUES "
+        + ", ".join(["(?, ?, ?, ?, ?)"] * len(test_routes)),
+        [value for route in test_routes for value in route],
     )
     conn.commit()
 
     yield db_path, conn
 
-    # Cleanup handled by temp_db fixture
+    # Cleanup handled by module_db fixture
 
 
-@pytest.fixture
-def client_with_routes(db_with_test_routes, test_settings) -> Generator[TestClient, None, None]:
+@pytest.fixture(scope="module")
+def client_with_routes(db_with_test_routes, module_client) -> TestClient:
     """Provide FastAPI TestClient with GTFS route data loaded.
 
-    This fixture combines db_with_test_routes and test_settings to provide
-    a client ready for testing route discovery endpoints.
+    This fixture combines db_with_test_routes and the module's shared
+    TestClient; both live for the whole module. Per-request state is
+    reset between tests by reset_module_db_state.
 
     Use this for testing:
     - GET /v1/routes
     - GET /v1/routes/search
     - Any endpoint that queries GTFS routes table
     """
-    from app.main import app
-    from app.config import get_settings
+    return module_client
 
-    # Clear settings cache to pick up test environment
-    get_settings.cache_clear()
 
-    # Create test client (lifespan will init DB)
-    with TestClient(app) as test_client:
-        yield test_client
+@pytest.fixture(scope="module")
+def db_with_test_schedule(module_db) -> Generator[tuple[str, sqlite3.Connection], None, None]:
+    """Provide database with a minimal GTFS schedule for stop 20558.
 
-    # Clear cache after test
-    get_settings.cache_clear()
+    Seeds two routes serving stop 20558 (Majestic), one weekday service and
+    one trip per route, so GET /v1/stops/{stop_id}/schedule returns real
+    departures and the route_id filter has something to exclude. The 500D
+    trip departs at 25:05:00 to cover GTFS times past midnight.
+
+    Module-scoped and read-only, like db_with_test_routes.
+    """
+    db_path, conn = module_db
+
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(
+        "INSERT OR IGNORE INTO routes (route_id, route_short_name, route_long_name, route_type) VALUES (?, ?, ?, ?)",
+        [
+            ("335E", "335-E", "Majestic to Electronic City", 3),
+            ("500D", "500-D", "Majestic to Hebbal", 3),
+        ],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO stops (stop_id, stop_name, stop_lat, stop_lon) VALUES (?, ?, ?, ?)",
+        [
+            ("20558", "Kempegowda Bus Station", 12.9767, 77.5713),
+            ("20559", "Corporation Circle", 12.9642, 77.5868),
+        ],
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO calendar VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ("WEEKDAY", 1, 1, 1, 1, 1, 0, 0, 20250101, 20261231),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO trips (trip_id, route_id, service_id, trip_headsign, direction_id) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("335E_1", "335E", "WEEKDAY", "Electronic City", 0),
+            ("500D_1", "500D", "WEEKDAY", "Hebbal", 1),
+        ],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO stop_times (trip_id, stop_sequence, stop_id, arrival_time, departure_time) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("335E_1", 1, "20558", "08:00:00", "08:00:00"),
+            ("335E_1", 2, "20559", "08:12:00", "08:12:00"),
+            ("500D_1", 1, "20558", "25:05:00", "25:05:00"),
+        ],
+    )
+    conn.commit()
+
+    yield db_path, conn
+
+
+@pytest.fixture(scope="module")
+def client_with_schedule(db_with_test_schedule, module_client) -> TestClient:
+    """Provide FastAPI TestClient with the db_with_test_schedule data loaded.
+
+    Use this for testing GET /v1/stops/{stop_id}/schedule.
+    """
+    return module_client
+
+
+@pytest.fixture(autouse=True)
+def reset_module_db_state(request):
+    """Truncate per-request state in a shared module database between tests.
+
+    Only acts for tests that run against module_db; per-test databases
+    start empty anyway.
+    """
+    if "module_db" in request.fixturenames:
+        from app.idempotency import clear_idempotency_cache
+
+        _, conn = request.getfixturevalue("module_db")
+        conn.executescript(
+            """
+            DELETE FROM idempotency_keys;
+            DELETE FROM rate_limit_buckets;
+            """
+        )
+        clear_idempotency_cache()
+
+    yield
 
 
 # ==============================================================================
@@ -412,8 +833,10 @@ def verify_test_isolation():
     print(f"pytest-xdist: installed")
     print(f"pytest-randomly: installed")
     print(f"Distribution strategy: loadfile (tests per-file in same worker)")
-    print(f"Settings cache: cleared before/after each test")
-    print(f"Database: temp file per test (integration) or :memory: (unit)")
+    print(f"Worker: {_xdist_worker()} (temp DBs: bmtc-test-{_xdist_worker()}-*.db)")
+    print(f"Settings cache: cleared around each test when the BMTC_* env may have changed")
+    print(f"Database: temp file per test (integration), per module (read-only GTFS seeds) or :memory: (unit), copied from a per-session schema template")
+    print(f"App/TestClient: one lifespan per session")
     print("=" * 70 + "\n")
 
     yield
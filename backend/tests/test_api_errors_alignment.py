@@ -15,8 +15,8 @@ error responses are standardized before implementation updates.
 Test Coverage:
 - POST /v1/ride_summary: 8 error tests
 - GET /v1/eta: 4 error tests
-- GET /v1/stops: 3 error tests
-- GET /v1/routes: 3 error tests
+- GET /v1/stops: 3 error cases (one parametrized test)
+- GET /v1/routes: 3 error cases (one parametrized test)
 - GET /v1/stops/{stop_id}/schedule: 3 error tests
 - GET /v1/config: 1 test (always succeeds)
 - GET /v1/health: 1 test (always returns 200)
@@ -25,7 +25,7 @@ Total: 23 comprehensive tests
 """
 
 import time
-import json
+import orjson
 import pytest
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
@@ -39,7 +39,9 @@ pytestmark = pytest.mark.integration
 # ==============================================================================
 
 
-def assert_error_response(response, expected_status: int, expected_error_code: str) -> dict:
+def assert_error_response(
+    response, expected_status: int, expected_error_code: str
+) -> tuple[dict, dict]:
     """Assert that response matches standardized error format.
 
     Validates:
@@ -55,7 +57,8 @@ def assert_error_response(response, expected_status: int, expected_error_code: s
         expected_error_code: Expected error code string
 
     Returns:
-        dict: The details object for further assertions
+        tuple[dict, dict]: The parsed body and its details object, so callers
+        never need to parse the response a second time
 
     Raises:
         AssertionError: If any validation fails
@@ -66,8 +69,8 @@ def assert_error_response(response, expected_status: int, expected_error_code: s
 
     # Assert response is valid JSON
     try:
-        data = response.json()
-    except json.JSONDecodeError as e:
+        data = orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
         pytest.fail(f"Response is not valid JSON: {e}")
 
     # Assert "error" field exists and matches expected code
@@ -86,43 +89,7 @@ def assert_error_response(response, expected_status: int, expected_error_code: s
     assert isinstance(data["details"], dict), \
         f"'details' field must be dict/object, got {type(data['details'])}"
 
-    return data["details"]
-
-
-def setup_test_segment(client):
-    """Helper to setup test segment via database."""
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-
-    # Insert segment (idempotent)
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-
-    # Get segment_id
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
-
-    # Insert segment_stats for all 192 bins (idempotent)
-    for bin_id in range(192):
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean)
-            VALUES (?, ?, ?)
-            """,
-            (segment_id, bin_id, 300.0),  # 5 min schedule baseline
-        )
-
-    conn.commit()
-    conn.close()
+    return data, data["details"]
 
 
 # ==============================================================================
@@ -130,12 +97,15 @@ def setup_test_segment(client):
 # ==============================================================================
 
 
-def test_ride_summary_missing_auth_header(client):
-    """Test POST /v1/ride_summary returns 401 unauthorized without Authorization header."""
-    setup_test_segment(client)
+@pytest.fixture(scope="module")
+def base_ride_payload() -> dict:
+    """Provide a valid one-segment ride_summary body, built once per module.
 
+    observed_at is frozen at module start; it stays inside the 7-day window
+    for the lifetime of the module.
+    """
     observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    ride_data = {
+    return {
         "route_id": "ROUTE1",
         "direction_id": 0,
         "device_bucket": "a" * 64,
@@ -150,54 +120,73 @@ def test_ride_summary_missing_auth_header(client):
         ],
     }
 
-    # Send request without Authorization header
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={"Idempotency-Key": str(uuid4())},
-    )
 
-    details = assert_error_response(response, 401, "unauthorized")
-    # Details may be empty or contain auth-related info
+def _ride_payload(base: dict, segment_fields: dict | None = None, **fields) -> dict:
+    """Return a copy of base with top-level and first-segment fields overridden."""
+    payload = {**base, **fields}
+    if segment_fields:
+        payload["segments"] = [{**base["segments"][0], **segment_fields}]
+    return payload
+
+
+def _iso_from_now(offset: timedelta) -> str:
+    return (datetime.now(timezone.utc) + offset).isoformat().replace("+00:00", "Z")
+
+
+@pytest.mark.parametrize(
+    "auth, fields, observed_offset, expected_status, expected_error_code",
+    [
+        # No Authorization header
+        pytest.param(None, {}, None, 401, "unauthorized", id="missing_auth_header"),
+        # Bearer token that does not match the API key
+        pytest.param("invalid", {}, None, 401, "unauthorized", id="invalid_auth_header"),
+        # direction_id should be int, not string
+        pytest.param("valid", {"direction_id": "invalid"}, None, 422, None, id="invalid_field_type"),
+        # Timestamp 8 days ago (outside valid window)
+        pytest.param("valid", {}, timedelta(days=-8), 422, None, id="stale_timestamp"),
+        # Timestamp 1 hour in the future
+        pytest.param("valid", {}, timedelta(hours=1), 422, None, id="future_timestamp"),
+    ],
+)
+def test_ride_summary_rejects_request(
+    client,
+    auth_headers,
+    seeded_segment,
+    base_ride_payload,
+    auth,
+    fields,
+    observed_offset,
+    expected_status,
+    expected_error_code,
+):
+    """Test POST /v1/ride_summary auth and validation errors for a single request.
+
+    Cases with an error code must follow the standardized error format;
+    422 validation cases only check the status and that the body is JSON
+    (FastAPI's default validation error format may differ).
+    """
+    segment_fields = None
+    if observed_offset is not None:
+        segment_fields = {"observed_at_utc": _iso_from_now(observed_offset)}
+    ride_data = _ride_payload(base_ride_payload, segment_fields, **fields)
 
+    headers = {"Idempotency-Key": str(uuid4())}
+    if auth == "valid":
+        headers.update(auth_headers)
+    elif auth == "invalid":
+        headers["Authorization"] = "Bearer invalid-token-12345"
 
-def test_ride_summary_invalid_auth_header(client):
-    """Test POST /v1/ride_summary returns 401 unauthorized with invalid Bearer token."""
-    setup_test_segment(client)
+    response = client.post("/v1/ride_summary", json=ride_data, headers=headers)
 
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "b" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
-
-    # Send request with invalid Bearer token
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={
-            "Authorization": "Bearer invalid-token-12345",
-            "Idempotency-Key": str(uuid4()),
-        },
-    )
-
-    details = assert_error_response(response, 401, "unauthorized")
+    if expected_error_code is not None:
+        assert_error_response(response, expected_status, expected_error_code)
+    else:
+        assert response.status_code == expected_status
+        orjson.loads(response.content)
 
 
-def test_ride_summary_malformed_json(client, auth_headers):
+def test_ride_summary_malformed_json(client, auth_headers, seeded_segment):
     """Test POST /v1/ride_summary returns 400 invalid_request for malformed JSON body."""
-    setup_test_segment(client)
-
     # Send malformed JSON (missing closing brace)
     response = client.post(
         "/v1/ride_summary",
@@ -214,161 +203,24 @@ def test_ride_summary_malformed_json(client, auth_headers):
     assert response.status_code in [400, 422]  # Accept both for now
 
     # Verify response structure (even if status code varies)
-    data = response.json()
+    data = orjson.loads(response.content)
     assert "error" in data or "detail" in data  # May not be standardized yet
 
 
-def test_ride_summary_invalid_field_type(client, auth_headers):
-    """Test POST /v1/ride_summary returns 422 validation_error for wrong field type."""
-    setup_test_segment(client)
-
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": "invalid",  # Should be int, not string
-        "device_bucket": "c" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
-
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
-
-    # Expect 422 for validation errors
-    assert response.status_code == 422
-
-    # Check if response follows standard format (may not be implemented yet)
-    data = response.json()
-    # FastAPI's default validation error format may differ
-
-
-def test_ride_summary_stale_timestamp(client, auth_headers):
-    """Test POST /v1/ride_summary returns 422 unprocessable for timestamp >7 days old."""
-    setup_test_segment(client)
-
-    # Create timestamp 8 days ago (outside valid window)
-    stale_time = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat().replace("+00:00", "Z")
-
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "d" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": stale_time,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
-
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
-
-    # Expect 422 for semantic validation error
-    assert response.status_code == 422
-
-    # Verify standardized error format (when implemented)
-    data = response.json()
-    # Should eventually have error, message, details fields
-
-
-def test_ride_summary_future_timestamp(client, auth_headers):
-    """Test POST /v1/ride_summary returns 422 unprocessable for future timestamp."""
-    setup_test_segment(client)
-
-    # Create timestamp 1 hour in the future
-    future_time = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat().replace("+00:00", "Z")
-
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "e" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": future_time,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
-
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
-
-    # Expect 422 for semantic validation error
-    assert response.status_code == 422
-
-    # Check response structure
-    data = response.json()
-    # Should eventually follow standard error format
-
-
-def test_ride_summary_idempotency_conflict(client, auth_headers):
+def test_ride_summary_idempotency_conflict(client, auth_headers, seeded_segment, base_ride_payload):
     """Test POST /v1/ride_summary returns 409 conflict for reused Idempotency-Key with different body."""
-    setup_test_segment(client)
-
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     idempotency_key = str(uuid4())
 
     # First request - should succeed
-    ride_data_1 = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "f" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
-
     response1 = client.post(
         "/v1/ride_summary",
-        json=ride_data_1,
+        json=base_ride_payload,
         headers={**auth_headers, "Idempotency-Key": idempotency_key},
     )
     assert response1.status_code == 200
 
     # Second request with SAME key but DIFFERENT body - should return 409
-    ride_data_2 = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "f" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 350.0,  # Different duration
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
+    ride_data_2 = _ride_payload(base_ride_payload, {"duration_sec": 350.0})
 
     response2 = client.post(
         "/v1/ride_summary",
@@ -376,61 +228,58 @@ def test_ride_summary_idempotency_conflict(client, auth_headers):
         headers={**auth_headers, "Idempotency-Key": idempotency_key},
     )
 
-    details = assert_error_response(response2, 409, "conflict")
+    _, details = assert_error_response(response2, 409, "conflict")
 
     # Details should contain idempotency_key
     assert "idempotency_key" in details, "Details should include idempotency_key"
     assert details["idempotency_key"] == idempotency_key
 
 
-def test_ride_summary_rate_limit(client, auth_headers, monkeypatch):
-    """Test POST /v1/ride_summary returns 429 rate_limited when quota exceeded."""
-    setup_test_segment(client)
+@pytest.fixture
+def rate_limited_settings(monkeypatch):
+    """Enable rate limiting with a quota of 2 requests/hour for one test.
+
+    The settings cache is cleared once when the override is applied and
+    once when it is torn down.
+    """
+    from app.config import get_settings
 
-    # Enable rate limiting with very low limit
     monkeypatch.setenv("BMTC_RATE_LIMIT_ENABLED", "true")
     monkeypatch.setenv("BMTC_RATE_LIMIT_PER_HOUR", "2")  # Only 2 requests allowed
+    get_settings.cache_clear()
+
+    yield get_settings()
 
-    # Clear settings cache to pick up new env vars
-    from app.config import get_settings
     get_settings.cache_clear()
 
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    device_bucket = "1" * 64
 
-    # Send 3 requests with same device_bucket
-    for i in range(3):
-        ride_data = {
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "device_bucket": device_bucket,
-            "segments": [
-                {
-                    "from_stop_id": "STOP_A",
-                    "to_stop_id": "STOP_B",
-                    "duration_sec": 300.0 + i,  # Vary duration to avoid idempotency
-                    "observed_at_utc": observed_at,
-                    "mapmatch_conf": 0.95,
-                }
-            ],
-        }
-
-        response = client.post(
-            "/v1/ride_summary",
-            json=ride_data,
-            headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-        )
-
-        if i < 2:
-            # First 2 requests should succeed
-            assert response.status_code == 200, f"Request {i+1} should succeed"
-        else:
-            # Third request should be rate limited
-            details = assert_error_response(response, 429, "rate_limited")
-
-            # Details should contain rate limit info
-            # Note: Field names may vary (limit, window, retry_after_sec, etc.)
-            assert len(details) > 0, "Details should contain rate limit information"
+def test_ride_summary_rate_limit(
+    client, auth_headers, seeded_segment, base_ride_payload, rate_limited_settings, post_concurrently
+):
+    """Test POST /v1/ride_summary returns 429 rate_limited when quota exceeded."""
+    # Send 3 requests with same device_bucket, vary duration to avoid idempotency
+    payloads = [
+        _ride_payload(base_ride_payload, {"duration_sec": 300.0 + i}, device_bucket="1" * 64)
+        for i in range(3)
+    ]
+
+    responses = post_concurrently(
+        [
+            ("/v1/ride_summary", payload, {**auth_headers, "Idempotency-Key": str(uuid4())})
+            for payload in payloads
+        ]
+    )
+
+    # Tokens are spent atomically, so exactly 2 requests succeed whatever the arrival order
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 200, 429], f"Expected two successes and one 429, got {statuses}"
+
+    limited = next(response for response in responses if response.status_code == 429)
+    _, details = assert_error_response(limited, 429, "rate_limited")
+
+    # Details should contain rate limit info
+    # Note: Field names may vary (limit, window, retry_after_sec, etc.)
+    assert len(details) > 0, "Details should contain rate limit information"
 
 
 # ==============================================================================
@@ -454,14 +303,12 @@ def test_eta_missing_required_params(client):
     assert response.status_code == 422
 
     # Check response structure (may not be standardized yet)
-    data = response.json()
+    data = orjson.loads(response.content)
     # Should eventually follow standard error format
 
 
-def test_eta_invalid_direction_id(client):
+def test_eta_invalid_direction_id(client, seeded_segment):
     """Test GET /v1/eta returns 400 invalid_request for direction_id not in {0,1}."""
-    setup_test_segment(client)
-
     # direction_id must be 0 or 1
     response = client.get(
         "/v1/eta",
@@ -477,10 +324,8 @@ def test_eta_invalid_direction_id(client):
     assert response.status_code in [400, 422]
 
 
-def test_eta_invalid_when_format(client):
+def test_eta_invalid_when_format(client, seeded_segment):
     """Test GET /v1/eta returns 400 invalid_request for malformed when timestamp."""
-    setup_test_segment(client)
-
     response = client.get(
         "/v1/eta",
         params={
@@ -492,7 +337,7 @@ def test_eta_invalid_when_format(client):
         },
     )
 
-    details = assert_error_response(response, 400, "invalid_request")
+    _, details = assert_error_response(response, 400, "invalid_request")
 
     # Details should mention the invalid parameter
     # (field names may vary: when, provided_value, etc.)
@@ -511,107 +356,71 @@ def test_eta_segment_not_found(client):
         },
     )
 
-    details = assert_error_response(response, 404, "not_found")
+    _, details = assert_error_response(response, 404, "not_found")
 
     # Details should contain segment identifiers
     # May include: route_id, direction_id, from_stop_id, to_stop_id
 
 
 # ==============================================================================
-# GET /v1/stops Error Tests (3 tests)
+# GET /v1/stops and GET /v1/routes Error Tests (3 tests each)
 # ==============================================================================
 
 
-def test_stops_invalid_bbox_format(client):
-    """Test GET /v1/stops returns 400 invalid_request for malformed bbox."""
-    # bbox should be "min_lat,min_lon,max_lat,max_lon" (4 values)
-    response = client.get(
-        "/v1/stops",
-        params={
-            "bbox": "12.9,77.5,13.0",  # Only 3 values - invalid
-        },
-    )
-
-    details = assert_error_response(response, 400, "invalid_request")
-
-    # Details should contain the invalid bbox value
-    assert "bbox" in details or len(details) > 0
-
-
-def test_stops_invalid_limit(client):
-    """Test GET /v1/stops returns 400 invalid_request for limit > 1000."""
-    response = client.get(
-        "/v1/stops",
-        params={
-            "limit": 1500,  # Exceeds max of 1000
-        },
-    )
-
-    # FastAPI validation may return 422
-    assert response.status_code in [400, 422]
-
-    # Check response structure
-    data = response.json()
-    # Should eventually follow standard error format
-
-
-def test_stops_invalid_offset(client):
-    """Test GET /v1/stops returns 400 invalid_request for negative offset."""
-    response = client.get(
-        "/v1/stops",
-        params={
-            "offset": -10,  # Negative offset is invalid
-        },
-    )
-
-    # FastAPI validation may return 422
-    assert response.status_code in [400, 422]
-
+def _assert_invalid_params_response(response, expected_error_code, field):
+    """Assert a query-param validation error.
 
-# ==============================================================================
-# GET /v1/routes Error Tests (3 tests)
-# ==============================================================================
-
-
-def test_routes_invalid_route_type(client):
-    """Test GET /v1/routes returns 400 invalid_request for route_type = 99 (must be 0-7)."""
-    response = client.get(
-        "/v1/routes",
-        params={
-            "route_type": 99,  # Invalid: GTFS route_type must be 0-7
-        },
-    )
-
-    details = assert_error_response(response, 400, "invalid_request")
-
-    # Details should mention route_type
-    assert "route_type" in details or len(details) > 0
-
-
-def test_routes_invalid_limit(client):
-    """Test GET /v1/routes returns 400 invalid_request for limit > 1000."""
-    response = client.get(
-        "/v1/routes",
-        params={
-            "limit": 2000,  # Exceeds max of 1000
-        },
-    )
+    Cases with an error code must follow the standardized error format and
+    name the field; the others may still be FastAPI's default 422 body.
+    """
+    if expected_error_code is not None:
+        _, details = assert_error_response(response, 400, expected_error_code)
+        assert field in details or len(details) > 0
+    else:
+        # FastAPI validation may return 422
+        assert response.status_code in [400, 422]
+        # Should eventually follow standard error format
+        orjson.loads(response.content)
+
+
+@pytest.mark.parametrize(
+    "params, field, expected_error_code",
+    [
+        # bbox should be "min_lat,min_lon,max_lat,max_lon" (4 values), only 3 given
+        pytest.param({"bbox": "12.9,77.5,13.0"}, "bbox", "invalid_request", id="bbox_format"),
+        # Exceeds max of 1000
+        pytest.param({"limit": 1500}, "limit", None, id="limit"),
+        # Negative offset is invalid
+        pytest.param({"offset": -10}, "offset", None, id="offset"),
+    ],
+)
+def test_stops_invalid_params(module_client, params, field, expected_error_code):
+    """Test GET /v1/stops returns 400 invalid_request for malformed query params.
+
+    Validation fails before any query runs, so the module's shared client and
+    database are enough.
+    """
+    response = module_client.get("/v1/stops", params=params)
 
-    # FastAPI validation may return 422
-    assert response.status_code in [400, 422]
+    _assert_invalid_params_response(response, expected_error_code, field)
 
 
-def test_routes_invalid_offset(client):
-    """Test GET /v1/routes returns 400 invalid_request for negative offset."""
-    response = client.get(
-        "/v1/routes",
-        params={
-            "offset": -5,  # Negative offset is invalid
-        },
-    )
+@pytest.mark.parametrize(
+    "params, field, expected_error_code",
+    [
+        # GTFS route_type must be 0-7
+        pytest.param({"route_type": 99}, "route_type", "invalid_request", id="route_type"),
+        # Exceeds max of 1000
+        pytest.param({"limit": 2000}, "limit", None, id="limit"),
+        # Negative offset is invalid
+        pytest.param({"offset": -5}, "offset", None, id="offset"),
+    ],
+)
+def test_routes_invalid_params(module_client, params, field, expected_error_code):
+    """Test GET /v1/routes returns 400 invalid_request for malformed query params."""
+    response = module_client.get("/v1/routes", params=params)
 
-    # FastAPI validation may return 422
-    assert response.status_code in [400, 422]
+    _assert_invalid_params_response(response, expected_error_code, field)
 
 
 # ==============================================================================
@@ -623,7 +432,7 @@ def test_schedule_stop_not_found(client):
     """Test GET /v1/stops/{stop_id}/schedule returns 404 not_found for non-existent stop."""
     response = client.get("/v1/stops/NONEXISTENT_STOP/schedule")
 
-    details = assert_error_response(response, 404, "not_found")
+    _, details = assert_error_response(response, 404, "not_found")
 
     # Details should contain stop_id
     assert "stop_id" in details
@@ -668,7 +477,7 @@ def test_config_always_succeeds(client):
     response = client.get("/v1/config")
 
     assert response.status_code == 200
-    data = response.json()
+    data = orjson.loads(response.content)
 
     # Should NOT have error field (this is a success response)
     assert "error" not in data
@@ -690,7 +499,7 @@ def test_health_always_returns_200(client):
 
     # Always returns 200 (check status field for actual health)
     assert response.status_code == 200
-    data = response.json()
+    data = orjson.loads(response.content)
 
     # Should NOT have error field (this is a success response)
     assert "error" not in data
@@ -17,64 +17,84 @@ Testing approach:
 - Ensure backward compatibility where applicable
 """
 
+import re
 import pytest
 from datetime import datetime, timezone
+from types import MappingProxyType
 
 
 pytestmark = pytest.mark.integration
 
+# UTC ISO-8601 timestamp as emitted by the API (optional fractional seconds)
+_ISO8601 = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z$")
+
+# Seeded ETA test segment (see module_seeded_segment); read-only so it can be shared
+ETA_PARAMS = MappingProxyType({
+    "route_id": "ROUTE1",
+    "direction_id": 0,
+    "from_stop_id": "STOP_A",
+    "to_stop_id": "STOP_B",
+})
+
+# Known stop from the spec example (Majestic Bus Station)
+SCHEDULE_STOP_ID = "20558"
+SCHEDULE_URL = f"/v1/stops/{SCHEDULE_STOP_ID}/schedule"
+
 
 # ==============================================================================
 # GET /v1/stops - GTFS Stop Discovery Tests
 # ==============================================================================
 
 
-def test_get_stops_basic_success(client):
-    """Test GET /v1/stops returns 200 OK with required response fields."""
-    response = client.get("/v1/stops")
+@pytest.fixture(scope="module")
+def stops_response(module_client):
+    """Fetch GET /v1/stops?limit=10 once per module for the shape tests."""
+    response = module_client.get("/v1/stops", params={"limit": 10})
 
     assert response.status_code == 200
-    data = response.json()
-
-    # Required top-level fields
-    assert "stops" in data
-    assert "total" in data
-    assert "limit" in data
-    assert "offset" in data
+    return response
 
-    # Verify types
-    assert isinstance(data["stops"], list)
-    assert isinstance(data["total"], int)
-    assert isinstance(data["limit"], int)
-    assert isinstance(data["offset"], int)
 
+@pytest.fixture(scope="module")
+def stops_data(stops_response) -> dict:
+    """Parsed body of stops_response, decoded once per module."""
+    return stops_response.json()
 
-def test_get_stops_item_has_gtfs_fields(client):
-    """Test each stop object contains required GTFS fields."""
-    response = client.get("/v1/stops", params={"limit": 1})
 
-    assert response.status_code == 200
-    data = response.json()
+@pytest.mark.parametrize(
+    "field, type_",
+    [("stops", list), ("total", int), ("limit", int), ("offset", int)],
+)
+def test_get_stops_response_fields(stops_data, field, type_):
+    """Test GET /v1/stops returns required top-level fields with correct types."""
+    assert field in stops_data
+    assert isinstance(stops_data[field], type_)
 
-    # If there are stops, verify GTFS field structure
-    if len(data["stops"]) > 0:
-        stop = data["stops"][0]
 
+@pytest.mark.parametrize(
+    "field, type_",
+    [
         # Required GTFS fields from stops.txt
-        assert "stop_id" in stop
-        assert "stop_name" in stop
-        assert "stop_lat" in stop
-        assert "stop_lon" in stop
+        ("stop_id", str),
+        ("stop_name", str),
+        ("stop_lat", (int, float)),
+        ("stop_lon", (int, float)),
+        # zone_id is optional in GTFS: must be present, but can be null
+        ("zone_id", (str, type(None))),
+    ],
+)
+def test_get_stops_item_gtfs_fields(stops_data, field, type_):
+    """Test each stop object contains required GTFS fields with correct types."""
+    # If there are stops, verify GTFS field structure
+    for stop in stops_data["stops"]:
+        assert field in stop
+        assert isinstance(stop[field], type_)
 
-        # zone_id is optional but must be present (can be null)
-        assert "zone_id" in stop
 
-        # Verify types
-        assert isinstance(stop["stop_id"], str)
-        assert isinstance(stop["stop_name"], str)
-        assert isinstance(stop["stop_lat"], (int, float))
-        assert isinstance(stop["stop_lon"], (int, float))
-        assert stop["zone_id"] is None or isinstance(stop["zone_id"], str)
+def test_get_stops_returns_x_api_version(stops_response):
+    """Test GET /v1/stops returns X-API-Version header."""
+    assert "X-API-Version" in stops_response.headers
+    assert stops_response.headers["X-API-Version"] == "1"
 
 
 def test_get_stops_with_limit_offset(client):
@@ -110,20 +130,6 @@ def test_get_stops_with_bbox_valid(client):
     assert isinstance(data["stops"], list)
 
 
-def test_get_stops_with_bbox_invalid(client):
-    """Test GET /v1/stops returns 400 for invalid bbox format."""
-    response = client.get("/v1/stops", params={"bbox": "invalid"})
-
-    assert response.status_code == 400
-    data = response.json()
-
-    # Error model from spec
-    assert data["error"] == "invalid_request"
-    assert "message" in data
-    assert "details" in data
-    assert "bbox" in data["details"]
-
-
 def test_get_stops_with_route_id(client):
     """Test GET /v1/stops accepts route_id filter parameter."""
     # Test that route_id parameter is accepted (actual filtering is implementation detail)
@@ -146,88 +152,70 @@ def test_get_stops_limit_respected(client):
     assert len(data["stops"]) <= 1
 
 
-def test_get_stops_zone_id_nullable(client):
-    """Test zone_id field can be null per GTFS spec."""
-    response = client.get("/v1/stops", params={"limit": 10})
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # At least one stop should exist in GTFS data
-    # zone_id is optional in GTFS, so null is valid
-    if len(data["stops"]) > 0:
-        for stop in data["stops"]:
-            # zone_id must be present, but can be null
-            assert "zone_id" in stop
-            if stop["zone_id"] is not None:
-                assert isinstance(stop["zone_id"], str)
-
-
-def test_get_stops_returns_x_api_version(client):
-    """Test GET /v1/stops returns X-API-Version header."""
-    response = client.get("/v1/stops")
-
-    assert response.status_code == 200
-    assert "X-API-Version" in response.headers
-    assert response.headers["X-API-Version"] == "1"
-
-
 # ==============================================================================
 # GET /v1/routes - GTFS Route Discovery Tests
 # ==============================================================================
 
 
-def test_get_routes_basic_success(client):
-    """Test GET /v1/routes returns 200 OK with required response fields."""
-    response = client.get("/v1/routes")
+@pytest.fixture(scope="module")
+def routes_response(module_client):
+    """Fetch GET /v1/routes?limit=10 once per module for the shape tests."""
+    response = module_client.get("/v1/routes", params={"limit": 10})
 
     assert response.status_code == 200
-    data = response.json()
+    return response
 
-    # Required top-level fields
-    assert "routes" in data
-    assert "total" in data
-    assert "limit" in data
-    assert "offset" in data
 
-    # Verify types
-    assert isinstance(data["routes"], list)
-    assert isinstance(data["total"], int)
-    assert isinstance(data["limit"], int)
-    assert isinstance(data["offset"], int)
+@pytest.fixture(scope="module")
+def routes_data(routes_response) -> dict:
+    """Parsed body of routes_response, decoded once per module."""
+    return routes_response.json()
 
 
-def test_get_routes_item_has_gtfs_fields(client):
-    """Test each route object contains required GTFS fields."""
-    response = client.get("/v1/routes", params={"limit": 1})
+@pytest.mark.parametrize(
+    "field, type_",
+    [("routes", list), ("total", int), ("limit", int), ("offset", int)],
+)
+def test_get_routes_response_fields(routes_data, field, type_):
+    """Test GET /v1/routes returns required top-level fields with correct types."""
+    assert field in routes_data
+    assert isinstance(routes_data[field], type_)
 
-    assert response.status_code == 200
-    data = response.json()
 
+@pytest.mark.parametrize(
+    "field, type_",
+    [
+        # Required GTFS fields
+        ("route_id", str),
+        ("route_type", int),
+        # agency_id is optional in GTFS: must be present, but can be null
+        ("agency_id", (str, type(None))),
+    ],
+)
+def test_get_routes_item_gtfs_fields(routes_data, field, type_):
+    """Test each route object contains required GTFS fields with correct types."""
     # If there are routes, verify GTFS field structure
-    if len(data["routes"]) > 0:
-        route = data["routes"][0]
+    for route in routes_data["routes"]:
+        assert field in route
+        assert isinstance(route[field], type_)
 
-        # Required GTFS fields
-        assert "route_id" in route
-        assert "route_type" in route
 
+def test_get_routes_item_names(routes_data):
+    """Test each route object carries at least one of its optional GTFS names."""
+    for route in routes_data["routes"]:
         # At least one of route_short_name or route_long_name must be present
         assert "route_short_name" in route or "route_long_name" in route
 
-        # agency_id is optional but must be present (can be null)
-        assert "agency_id" in route
-
-        # Verify types
-        assert isinstance(route["route_id"], str)
-        assert isinstance(route["route_type"], int)
-
         if route.get("route_short_name") is not None:
             assert isinstance(route["route_short_name"], str)
         if route.get("route_long_name") is not None:
             assert isinstance(route["route_long_name"], str)
-        if route["agency_id"] is not None:
-            assert isinstance(route["agency_id"], str)
+
+
+def test_get_routes_returns_x_api_version(routes_response):
+    """Test GET /v1/routes returns X-API-Version header."""
+    assert "X-API-Version" in routes_response.headers
+    assert routes_response.headers["X-API-Version"] == "1"
 
 
 def test_get_routes_with_limit_offset(client):
@@ -259,26 +247,10 @@ def test_get_routes_with_route_type_valid(client):
     assert "routes" in data
 
 
-def test_get_routes_with_route_type_invalid(client):
-    """Test GET /v1/routes returns 400 for invalid route_type."""
-    # route_type must be 0-7 per GTFS spec; 99 is invalid
-    response = client.get("/v1/routes", params={"route_type": 99})
-
-    assert response.status_code == 400
-    data = response.json()
-
-    # Error model from spec
-    assert data["error"] == "invalid_request"
-    assert "message" in data
-    assert "details" in data
-    assert "route_type" in data["details"]
-    assert data["details"]["route_type"] == 99
-
-
 def test_get_routes_with_stop_id(client):
     """Test GET /v1/routes accepts stop_id filter parameter."""
     # Test that stop_id parameter is accepted
-    response = client.get("/v1/routes", params={"stop_id": "20558"})
+    response = client.get("/v1/routes", params={"stop_id": SCHEDULE_STOP_ID})
 
     # Should return 200 OK (may be empty if stop doesn't exist in test DB)
     assert response.status_code == 200
@@ -286,260 +258,198 @@ def test_get_routes_with_stop_id(client):
     assert "routes" in data
 
 
-def test_get_routes_agency_id_nullable(client):
-    """Test agency_id field can be null per GTFS spec."""
-    response = client.get("/v1/routes", params={"limit": 10})
-
-    assert response.status_code == 200
-    data = response.json()
-
-    # agency_id is optional in GTFS, so null is valid
-    if len(data["routes"]) > 0:
-        for route in data["routes"]:
-            # agency_id must be present, but can be null
-            assert "agency_id" in route
-            if route["agency_id"] is not None:
-                assert isinstance(route["agency_id"], str)
-
-
-def test_get_routes_returns_x_api_version(client):
-    """Test GET /v1/routes returns X-API-Version header."""
-    response = client.get("/v1/routes")
-
-    assert response.status_code == 200
-    assert "X-API-Version" in response.headers
-    assert response.headers["X-API-Version"] == "1"
-
-
 # ==============================================================================
 # GET /v1/stops/{stop_id}/schedule - GTFS Schedule Tests
 # ==============================================================================
 
 
-def test_get_schedule_basic_success(client):
-    """Test GET /v1/stops/{stop_id}/schedule returns 200 OK with required fields."""
-    # Use a known stop_id from GTFS (assuming GTFS is loaded in test DB)
-    # If no GTFS data, test may need to be skipped or use fixture data
-    stop_id = "20558"  # From spec example (Majestic Bus Station)
+@pytest.fixture(scope="module")
+def schedule_response(client_with_schedule):
+    """Fetch the schedule for a known stop once per module for the shape tests.
 
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
+    Uses SCHEDULE_STOP_ID, which db_with_test_schedule seeds with two
+    departures.
+    """
+    response = client_with_schedule.get(SCHEDULE_URL)
 
-    # Should return 200 (may have empty departures if no schedule data)
-    assert response.status_code in [200, 404]  # 404 if stop not in test GTFS
+    assert response.status_code == 200
+    return response
 
-    if response.status_code == 200:
-        data = response.json()
 
-        # Required top-level fields
-        assert "stop" in data
-        assert "departures" in data
-        assert "query_time" in data
+@pytest.fixture(scope="module")
+def schedule_data(schedule_response) -> dict:
+    """Parsed body of schedule_response, decoded once per module."""
+    return schedule_response.json()
 
-        # Verify types
-        assert isinstance(data["stop"], dict)
-        assert isinstance(data["departures"], list)
-        assert isinstance(data["query_time"], str)
 
+def test_get_schedule_basic_success(schedule_data):
+    """Test GET /v1/stops/{stop_id}/schedule returns 200 OK with required fields."""
+    data = schedule_data
 
-def test_get_schedule_stop_object_fields(client):
-    """Test stop object contains required GTFS fields."""
-    stop_id = "20558"
+    # Required top-level fields
+    assert "stop" in data
+    assert "departures" in data
+    assert "query_time" in data
+
+    # Verify types
+    assert isinstance(data["stop"], dict)
+    assert isinstance(data["departures"], list)
+    assert isinstance(data["query_time"], str)
 
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
+    # Both seeded trips stop here, ordered by departure_time
+    assert [d["trip"]["trip_id"] for d in data["departures"]] == ["335E_1", "500D_1"]
 
-    if response.status_code == 200:
-        data = response.json()
-        stop = data["stop"]
 
+@pytest.mark.parametrize(
+    "field, type_",
+    [
         # Required fields from GTFS stops.txt
-        assert "stop_id" in stop
-        assert "stop_name" in stop
-        assert "stop_lat" in stop
-        assert "stop_lon" in stop
+        ("stop_id", str),
+        ("stop_name", str),
+        ("stop_lat", (int, float)),
+        ("stop_lon", (int, float)),
+    ],
+)
+def test_get_schedule_stop_object_fields(schedule_data, field, type_):
+    """Test stop object contains required GTFS fields."""
+    stop = schedule_data["stop"]
 
-        # Verify types
-        assert isinstance(stop["stop_id"], str)
-        assert isinstance(stop["stop_name"], str)
-        assert isinstance(stop["stop_lat"], (int, float))
-        assert isinstance(stop["stop_lon"], (int, float))
+    assert field in stop
+    assert isinstance(stop[field], type_)
 
 
-def test_get_schedule_departure_structure(client):
+def test_get_schedule_departure_structure(schedule_data):
     """Test departure objects have trip and stop_time structure."""
-    stop_id = "20558"
-
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
-
-    if response.status_code == 200:
-        data = response.json()
-        departures = data["departures"]
-
-        # If there are departures, verify structure
-        if len(departures) > 0:
-            departure = departures[0]
+    for departure in schedule_data["departures"]:
+        # Required nested objects
+        assert "trip" in departure
+        assert "stop_time" in departure
 
-            # Required nested objects
-            assert "trip" in departure
-            assert "stop_time" in departure
+        assert isinstance(departure["trip"], dict)
+        assert isinstance(departure["stop_time"], dict)
 
-            assert isinstance(departure["trip"], dict)
-            assert isinstance(departure["stop_time"], dict)
 
-
-def test_get_schedule_trip_fields(client):
+def test_get_schedule_trip_fields(schedule_data):
     """Test trip object contains required GTFS fields."""
-    stop_id = "20558"
-
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
-
-    if response.status_code == 200:
-        data = response.json()
-        departures = data["departures"]
+    trip = schedule_data["departures"][0]["trip"]
 
-        if len(departures) > 0:
-            trip = departures[0]["trip"]
+    # Required GTFS fields
+    assert "trip_id" in trip
+    assert "route_id" in trip
+    assert "service_id" in trip
 
-            # Required GTFS fields
-            assert "trip_id" in trip
-            assert "route_id" in trip
-            assert "service_id" in trip
+    # Optional GTFS fields (present, may be null)
+    assert "trip_headsign" in trip
+    assert "direction_id" in trip
 
-            # Optional GTFS fields (must be present, can be null)
-            assert "trip_headsign" in trip or True  # Optional
-            assert "direction_id" in trip or True  # Optional
+    # Verify required field types
+    assert isinstance(trip["trip_id"], str)
+    assert isinstance(trip["route_id"], str)
+    assert isinstance(trip["service_id"], str)
 
-            # Verify required field types
-            assert isinstance(trip["trip_id"], str)
-            assert isinstance(trip["route_id"], str)
-            assert isinstance(trip["service_id"], str)
+    if trip["direction_id"] is not None:
+        assert isinstance(trip["direction_id"], int)
+        assert trip["direction_id"] in [0, 1]
 
-            if "direction_id" in trip and trip["direction_id"] is not None:
-                assert isinstance(trip["direction_id"], int)
-                assert trip["direction_id"] in [0, 1]
 
-
-def test_get_schedule_stop_time_fields(client):
+def test_get_schedule_stop_time_fields(schedule_data):
     """Test stop_time object contains required GTFS fields."""
-    stop_id = "20558"
+    stop_time = schedule_data["departures"][0]["stop_time"]
 
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
+    # Required GTFS fields (HH:MM:SS format)
+    assert "arrival_time" in stop_time
+    assert "departure_time" in stop_time
+    assert "stop_sequence" in stop_time
 
-    if response.status_code == 200:
-        data = response.json()
-        departures = data["departures"]
+    # pickup_type and drop_off_type are not in our DB (return null per spec)
+    assert "pickup_type" in stop_time
+    assert "drop_off_type" in stop_time
 
-        if len(departures) > 0:
-            stop_time = departures[0]["stop_time"]
+    # Verify types
+    assert isinstance(stop_time["arrival_time"], str)
+    assert isinstance(stop_time["departure_time"], str)
+    assert isinstance(stop_time["stop_sequence"], int)
 
-            # Required GTFS fields (HH:MM:SS format)
-            assert "arrival_time" in stop_time
-            assert "departure_time" in stop_time
-            assert "stop_sequence" in stop_time
+    # Verify HH:MM:SS format (basic check)
+    assert ":" in stop_time["arrival_time"]
+    assert ":" in stop_time["departure_time"]
 
-            # pickup_type and drop_off_type are not in our DB (return null per spec)
-            assert "pickup_type" in stop_time
-            assert "drop_off_type" in stop_time
+    # pickup_type and drop_off_type should be null (not in our DB)
+    assert stop_time["pickup_type"] is None or isinstance(stop_time["pickup_type"], int)
+    assert stop_time["drop_off_type"] is None or isinstance(stop_time["drop_off_type"], int)
 
-            # Verify types
-            assert isinstance(stop_time["arrival_time"], str)
-            assert isinstance(stop_time["departure_time"], str)
-            assert isinstance(stop_time["stop_sequence"], int)
 
-            # Verify HH:MM:SS format (basic check)
-            assert ":" in stop_time["arrival_time"]
-            assert ":" in stop_time["departure_time"]
+def test_get_schedule_keeps_times_past_midnight(schedule_data):
+    """Test GTFS times beyond 24:00:00 are returned unchanged."""
+    stop_time = schedule_data["departures"][-1]["stop_time"]
 
-            # pickup_type and drop_off_type should be null (not in our DB)
-            assert stop_time["pickup_type"] is None or isinstance(stop_time["pickup_type"], int)
-            assert stop_time["drop_off_type"] is None or isinstance(stop_time["drop_off_type"], int)
+    assert stop_time["departure_time"] == "25:05:00"
 
 
-def test_get_schedule_query_time_iso8601(client):
+def test_get_schedule_query_time_iso8601(schedule_data):
     """Test query_time is returned as ISO-8601 string."""
-    stop_id = "20558"
+    query_time = schedule_data["query_time"]
 
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
-
-    if response.status_code == 200:
-        data = response.json()
-        query_time = data["query_time"]
-
-        # Verify ISO-8601 format
-        assert isinstance(query_time, str)
-        assert "T" in query_time
-        assert query_time.endswith("Z")
+    # Verify ISO-8601 format
+    assert isinstance(query_time, str)
+    assert _ISO8601.fullmatch(query_time)
 
-        # Verify it can be parsed
-        parsed = datetime.fromisoformat(query_time.replace("Z", "+00:00"))
-        assert parsed.tzinfo is not None
 
+def test_get_schedule_with_route_filter(client_with_schedule):
+    """Test GET /v1/stops/{stop_id}/schedule accepts route_id filter."""
+    response = client_with_schedule.get(SCHEDULE_URL, params={"route_id": "335E"})
 
-def test_get_schedule_stop_not_found(client):
-    """Test GET /v1/stops/{stop_id}/schedule returns 404 for nonexistent stop."""
-    # Use clearly invalid stop_id
-    stop_id = "99999"
+    assert response.status_code == 200
 
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
+    departures = response.json()["departures"]
+    assert [d["trip"]["route_id"] for d in departures] == ["335E"]
 
-    assert response.status_code == 404
-    data = response.json()
 
-    # Error model from spec
-    assert data["error"] == "not_found"
-    assert "message" in data
-    assert "Stop not found" in data["message"] or "not found" in data["message"].lower()
-    assert "details" in data
-    assert "stop_id" in data["details"]
-    assert data["details"]["stop_id"] == stop_id
+def test_get_schedule_returns_x_api_version(module_client):
+    """Test GET /v1/stops/{stop_id}/schedule returns X-API-Version header."""
+    # Should have header regardless of 200 or 404
+    schedule_response = module_client.get(SCHEDULE_URL)
+    assert "X-API-Version" in schedule_response.headers
+    assert schedule_response.headers["X-API-Version"] == "1"
 
 
-def test_get_schedule_invalid_time_window(client):
-    """Test GET /v1/stops/{stop_id}/schedule returns 400 for invalid time_window_minutes."""
-    stop_id = "20558"
+# ==============================================================================
+# Error Envelope Tests (all GTFS endpoints)
+# ==============================================================================
 
-    # time_window_minutes max is 180 per spec
-    response = client.get(
-        f"/v1/stops/{stop_id}/schedule",
-        params={"time_window_minutes": 300}
-    )
 
-    assert response.status_code == 400
+@pytest.mark.parametrize(
+    "url, params, status, error, detail_key, detail_value",
+    [
+        # bbox must be "min_lat,min_lon,max_lat,max_lon"
+        pytest.param("/v1/stops", {"bbox": "invalid"}, 400, "invalid_request", "bbox", None, id="stops_bbox"),
+        # route_type must be 0-7 per GTFS spec; 99 is invalid
+        pytest.param("/v1/routes", {"route_type": 99}, 400, "invalid_request", "route_type", 99, id="routes_route_type"),
+        # time_window_minutes max is 180 per spec
+        pytest.param(
+            SCHEDULE_URL, {"time_window_minutes": 300},
+            400, "invalid_request", "time_window_minutes", 300, id="schedule_time_window",
+        ),
+        # Clearly invalid stop_id
+        pytest.param("/v1/stops/99999/schedule", {}, 404, "not_found", "stop_id", "99999", id="schedule_stop_not_found"),
+    ],
+)
+def test_error_envelope(module_client, url, params, status, error, detail_key, detail_value):
+    """Test GTFS endpoints return the spec error model for invalid requests."""
+    response = module_client.get(url, params=params)
+
+    assert response.status_code == status
     data = response.json()
 
     # Error model from spec
-    assert data["error"] == "invalid_request"
+    assert data["error"] == error
     assert "message" in data
     assert "details" in data
-    assert "time_window_minutes" in data["details"]
-    assert data["details"]["time_window_minutes"] == 300
-
-
-def test_get_schedule_with_route_filter(client):
-    """Test GET /v1/stops/{stop_id}/schedule accepts route_id filter."""
-    stop_id = "20558"
-
-    response = client.get(
-        f"/v1/stops/{stop_id}/schedule",
-        params={"route_id": "335E"}
-    )
-
-    # Should return 200 or 404 (depending on test GTFS data)
-    assert response.status_code in [200, 404]
-
-    if response.status_code == 200:
-        data = response.json()
-        assert "departures" in data
-
-
-def test_get_schedule_returns_x_api_version(client):
-    """Test GET /v1/stops/{stop_id}/schedule returns X-API-Version header."""
-    stop_id = "20558"
-
-    response = client.get(f"/v1/stops/{stop_id}/schedule")
-
-    # Should have header regardless of 200 or 404
-    assert "X-API-Version" in response.headers
-    assert response.headers["X-API-Version"] == "1"
+    assert detail_key in data["details"]
+    if detail_value is not None:
+        assert data["details"][detail_key] == detail_value
+    if status == 404:
+        assert "not found" in data["message"].lower()
 
 
 # ==============================================================================
@@ -547,89 +457,39 @@ def test_get_schedule_returns_x_api_version(client):
 # ==============================================================================
 
 
-def setup_test_segment_for_eta(client):
-    """Helper to setup test segment for ETA tests."""
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-
-    # Insert segment (idempotent)
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-
-    # Get segment_id
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
+@pytest.fixture(scope="module")
+def eta_response(module_client, module_seeded_segment) -> dict:
+    """Fetch the default ETA response once per module.
 
-    # Insert segment_stats for all 192 bins (idempotent)
-    for bin_id in range(192):
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean)
-            VALUES (?, ?, ?)
-            """,
-            (segment_id, bin_id, 300.0),  # 5 min schedule baseline
-        )
+    The shape tests below only inspect different parts of the same
+    /v1/eta payload, so they share one request instead of re-running the
+    endpoint per test. Tests whose inputs differ make their own call.
+    """
+    response = module_client.get("/v1/eta", params=ETA_PARAMS)
 
-    conn.commit()
-    conn.close()
+    assert response.status_code == 200
+    return response.json()
 
 
-def test_get_eta_new_structure_basic(client):
+def test_get_eta_new_structure_basic(eta_response):
     """Test GET /v1/eta returns new structured response with all required objects."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
 
     # New v1.1 structure: four top-level objects
-    assert "segment" in data
-    assert "query_time" in data
-    assert "scheduled" in data
-    assert "prediction" in data
+    assert "segment" in eta_response
+    assert "query_time" in eta_response
+    assert "scheduled" in eta_response
+    assert "prediction" in eta_response
 
     # Verify types
-    assert isinstance(data["segment"], dict)
-    assert isinstance(data["query_time"], str)
-    assert isinstance(data["scheduled"], dict)
-    assert isinstance(data["prediction"], dict)
+    assert isinstance(eta_response["segment"], dict)
+    assert isinstance(eta_response["query_time"], str)
+    assert isinstance(eta_response["scheduled"], dict)
+    assert isinstance(eta_response["prediction"], dict)
 
 
-def test_get_eta_segment_object_fields(client):
+def test_get_eta_segment_object_fields(eta_response):
     """Test segment object contains GTFS identifiers."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    segment = data["segment"]
+    segment = eta_response["segment"]
 
     # Required GTFS identifiers
     assert "route_id" in segment
@@ -644,51 +504,18 @@ def test_get_eta_segment_object_fields(client):
     assert segment["to_stop_id"] == "STOP_B"
 
 
-def test_get_eta_query_time_iso8601(client):
+def test_get_eta_query_time_iso8601(eta_response):
     """Test query_time is returned as ISO-8601 string."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    query_time = data["query_time"]
+    query_time = eta_response["query_time"]
 
     # Verify ISO-8601 format
     assert isinstance(query_time, str)
-    assert "T" in query_time
-    assert query_time.endswith("Z")
-
-    # Verify it can be parsed
-    parsed = datetime.fromisoformat(query_time.replace("Z", "+00:00"))
-    assert parsed.tzinfo is not None
+    assert _ISO8601.fullmatch(query_time)
 
 
-def test_get_eta_scheduled_object_fields(client):
+def test_get_eta_scheduled_object_fields(eta_response):
     """Test scheduled object contains GTFS schedule data."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    scheduled = data["scheduled"]
+    scheduled = eta_response["scheduled"]
 
     # Required fields from GTFS layer
     assert "duration_sec" in scheduled
@@ -704,23 +531,9 @@ def test_get_eta_scheduled_object_fields(client):
     assert scheduled["source"] == "gtfs"
 
 
-def test_get_eta_prediction_object_fields(client):
+def test_get_eta_prediction_object_fields(eta_response):
     """Test prediction object contains all ML prediction fields."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    prediction = data["prediction"]
+    prediction = eta_response["prediction"]
 
     # Required ML prediction fields
     required_fields = [
@@ -739,73 +552,33 @@ def test_get_eta_prediction_object_fields(client):
         assert field in prediction, f"Missing required field: {field}"
 
 
-def test_get_eta_confidence_values(client):
+def test_get_eta_confidence_values(eta_response):
     """Test confidence field is one of the valid values."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    confidence = data["prediction"]["confidence"]
+    confidence = eta_response["prediction"]["confidence"]
 
     # confidence must be one of: "high", "medium", "low"
     assert confidence in ["high", "medium", "low"]
 
 
-def test_get_eta_prediction_last_updated_iso8601(client):
+def test_get_eta_prediction_last_updated_iso8601(eta_response):
     """Test prediction.last_updated is ISO-8601 string."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    last_updated = data["prediction"]["last_updated"]
+    last_updated = eta_response["prediction"]["last_updated"]
 
     # Verify ISO-8601 format
     assert isinstance(last_updated, str)
-    assert "T" in last_updated
-    assert last_updated.endswith("Z")
+    assert _ISO8601.fullmatch(last_updated)
+
 
-    # Verify it can be parsed
-    parsed = datetime.fromisoformat(last_updated.replace("Z", "+00:00"))
-    assert parsed.tzinfo is not None
+def test_get_eta_timestamps_parse_as_utc(eta_response):
+    """Test query_time and prediction.last_updated are real, timezone-aware instants."""
+    for value in (eta_response["query_time"], eta_response["prediction"]["last_updated"]):
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        assert parsed.tzinfo is not None
 
 
-def test_get_eta_prediction_field_types(client):
+def test_get_eta_prediction_field_types(eta_response):
     """Test prediction fields have correct types."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    prediction = data["prediction"]
+    prediction = eta_response["prediction"]
 
     # Numeric fields
     assert isinstance(prediction["predicted_duration_sec"], (int, float))
@@ -821,66 +594,24 @@ def test_get_eta_prediction_field_types(client):
     assert isinstance(prediction["model_version"], str)
 
 
-def test_get_eta_bin_id_valid_range(client):
+def test_get_eta_bin_id_valid_range(eta_response):
     """Test bin_id is in valid range [0, 191]."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    bin_id = data["prediction"]["bin_id"]
+    bin_id = eta_response["prediction"]["bin_id"]
 
     # 192 bins total (0-191)
-    assert 0 <= bin_id <= 191
+    assert bin_id in range(192)
 
 
-def test_get_eta_source_is_gtfs(client):
+def test_get_eta_source_is_gtfs(eta_response):
     """Test scheduled.source is always 'gtfs'."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
 
     # source field indicates data origin
-    assert data["scheduled"]["source"] == "gtfs"
+    assert eta_response["scheduled"]["source"] == "gtfs"
 
 
-def test_get_eta_no_gtfs_field_collision(client):
+def test_get_eta_no_gtfs_field_collision(eta_response):
     """Test prediction fields don't collide with GTFS field names."""
-    setup_test_segment_for_eta(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-    prediction = data["prediction"]
+    prediction = eta_response["prediction"]
 
     # Prediction fields should NOT use GTFS reserved names
     # (e.g., no "stop_id", "route_id", "trip_id", etc. in prediction object)
@@ -894,23 +625,12 @@ def test_get_eta_no_gtfs_field_collision(client):
             f"Prediction object should not contain GTFS field: {reserved}"
 
 
-def test_get_eta_new_format_with_when_parameter(client):
+def test_get_eta_new_format_with_when_parameter(module_client, module_seeded_segment):
     """Test new structured format works with 'when' parameter."""
-    setup_test_segment_for_eta(client)
-
     # Use 'when' parameter with ISO-8601 timestamp
     when_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-            "when": when_time,
-        },
-    )
+    response = module_client.get("/v1/eta", params={**ETA_PARAMS, "when": when_time})
 
     assert response.status_code == 200
     data = response.json()
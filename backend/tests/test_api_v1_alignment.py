@@ -10,195 +10,152 @@ defined in docs/api.md, including:
 - Validation and error handling
 """
 
-import time
+import itertools
+import sys
+import httpx
+import orjson
 import pytest
 from datetime import datetime, timedelta, timezone
-from uuid import uuid4
+from types import MappingProxyType
 
 
-pytestmark = pytest.mark.integration
+pytestmark = [
+    pytest.mark.integration,
+    # Every test here pulls in module_client; keep the module on one worker
+    # under --dist=loadgroup so that setup is not repeated per worker
+    pytest.mark.xdist_group("api_v1_schema"),
+]
 
+# Reference "now" for the offset timestamps, captured once at import; the
+# suite finishes well inside the 7-day window the API validates against
+_NOW = datetime.now(timezone.utc)
+_NOW_EPOCH = int(_NOW.timestamp())
+_ONE_HOUR_AGO = _NOW_EPOCH - 3600
 
-def setup_test_segment(client):
-    """Helper to setup test segment via database."""
-    from app.config import get_settings
-    from app.db import get_connection
 
-    settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 with a "Z" suffix (second precision)."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    # Insert segment (idempotent)
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
 
-    # Get segment_id
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
-
-    # Insert segment_stats for all 192 bins (idempotent)
-    for bin_id in range(192):
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean)
-            VALUES (?, ?, ?)
-            """,
-            (segment_id, bin_id, 300.0),  # 5 min schedule baseline
-        )
+def _utc_iso(delta: timedelta) -> str:
+    """UTC ISO-8601 string ("Z" suffix) for _NOW shifted by delta."""
+    return (_NOW + delta).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    conn.commit()
-    conn.close()
 
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the "Z" suffix natively from 3.11
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        """Parse an ISO-8601 string with a "Z" suffix (Python < 3.11)."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
-# ==============================================================================
-# POST /v1/ride_summary - Request Schema Tests
-# ==============================================================================
 
+# Fixed timestamps outside the accepted window: any time in the future, or
+# more than 7 days in the past, is rejected
+_FUTURE_ISO = "2099-01-01T00:00:00Z"
+_STALE_ISO = "2020-01-01T00:00:00Z"
 
-def test_post_ride_summary_with_top_level_device_bucket(client, auth_headers):
-    """Test POST /v1/ride_summary with device_bucket at top-level (v1 spec)."""
-    setup_test_segment(client)
+# JSON numbers may decode as int or float
+_NUM = (int, float)
 
-    # Create ISO-8601 timestamp
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+# Valid device buckets (64 hex chars), kept distinct across the posting tests
+_BUCKET_A = "a" * 64
+_BUCKET_B = "b" * 64
+_BUCKET_C = "c" * 64
+_BUCKET_D = "d" * 64
+_BUCKET_E = "e" * 64
+_BUCKET_F = "f" * 64
+_BUCKET_1 = "1" * 64
+_BUCKET_2 = "2" * 64
+_BUCKET_3 = "3" * 64
+_BUCKET_5 = "5" * 64
+_BUCKET_6 = "6" * 64
+_BUCKET_7 = "7" * 64
+_BUCKET_8 = "8" * 64
+_BUCKET_9 = "9" * 64
 
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "a" * 64,  # Valid SHA256 hex string
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 320.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
+# Shared ride_summary body parts; tests spread them into fresh dicts
+_BASE_RIDE = {"route_id": "ROUTE1", "direction_id": 0}
+_BASE_SEG = {"from_stop_id": "STOP_A", "to_stop_id": "STOP_B", "mapmatch_conf": 0.95}
 
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
+# Canonical seeded test segment (seeded_segment, module_seeded_segment); read-only
+ETA_PARAMS = MappingProxyType({
+    "route_id": "ROUTE1",
+    "direction_id": 0,
+    "from_stop_id": "STOP_A",
+    "to_stop_id": "STOP_B",
+})
 
-    assert response.status_code == 200
-    data = response.json()
-    assert "accepted_segments" in data
-    assert "rejected_segments" in data
-    assert data["accepted_segments"] == 1
-    assert data["rejected_segments"] == 0
+# Idempotency keys only need to be unique for the life of the test app
+_idem = itertools.count()
 
 
-def test_post_ride_summary_with_iso8601_timestamp(client, auth_headers):
-    """Test POST /v1/ride_summary accepts ISO-8601 timestamp (observed_at_utc)."""
-    setup_test_segment(client)
+def _idem_key() -> str:
+    """Next unique Idempotency-Key for this module."""
+    return f"test-{next(_idem):032x}"
 
-    # Create ISO-8601 timestamp 1 hour ago
-    observed_at = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat().replace("+00:00", "Z")
 
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "b" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 310.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.92,
-            }
-        ],
-    }
+def _with_idem_key(base: httpx.Headers) -> httpx.Headers:
+    """Copy of base request headers with a fresh Idempotency-Key."""
+    headers = base.copy()
+    headers["Idempotency-Key"] = _idem_key()
+    return headers
 
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["accepted_segments"] == 1
+@pytest.fixture(scope="module")
+def post_headers(auth_headers) -> httpx.Headers:
+    """Auth and JSON content headers for ride_summary POSTs, built once per module.
 
-
-def test_post_ride_summary_backward_compat_epoch_timestamp(client, auth_headers):
-    """Test backward compatibility: accept epoch timestamp (timestamp_utc)."""
-    setup_test_segment(client)
-
-    # Use deprecated timestamp_utc field (observed_at_utc is optional for backward compat)
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "c" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 305.0,
-                "timestamp_utc": int(time.time()) - 3600,  # 1h ago
-                "mapmatch_conf": 0.90,
-            }
-        ],
-    }
-
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
-
-    # Should accept but log deprecation warning
-    assert response.status_code == 200
-    data = response.json()
-    assert data["accepted_segments"] == 1
+    Tests send _with_idem_key(post_headers), so only the Idempotency-Key
+    is added per request.
+    """
+    return httpx.Headers({**auth_headers, "Content-Type": "application/json"})
 
 
 # ==============================================================================
-# POST /v1/ride_summary - Response Schema Tests
+# POST /v1/ride_summary - Request Schema Tests
 # ==============================================================================
 
 
-def test_post_response_has_accepted_segments_field(client, auth_headers):
-    """Test POST response has accepted_segments (not 'accepted')."""
-    setup_test_segment(client)
-
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
+@pytest.mark.parametrize(
+    "device_bucket, ts_field, ts_value, duration_sec, conf",
+    [
+        # device_bucket at top-level (v1 spec)
+        pytest.param(_BUCKET_A, "observed_at_utc", _utc_iso(timedelta()), 320.0, 0.95, id="top_level_device_bucket"),
+        # ISO-8601 timestamp 1 hour ago
+        pytest.param(_BUCKET_B, "observed_at_utc", _utc_iso(timedelta(hours=-1)), 310.0, 0.92, id="iso8601_timestamp"),
+        # Deprecated epoch timestamp_utc (observed_at_utc is optional for backward compat)
+        pytest.param(_BUCKET_C, "timestamp_utc", _ONE_HOUR_AGO, 305.0, 0.90, id="backward_compat_epoch_timestamp"),
+        pytest.param(_BUCKET_D, "observed_at_utc", _utc_iso(timedelta()), 315.0, 0.88, id="accepted_segments_field"),
+    ],
+)
+def test_post_ride_summary_accepts_valid_ride(
+    client, post_headers, seeded_segment, device_bucket, ts_field, ts_value, duration_sec, conf
+):
+    """Test POST /v1/ride_summary accepts a valid v1 ride and returns the v1 response schema."""
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "d" * 64,
+        **_BASE_RIDE,
+        "device_bucket": device_bucket,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 315.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.88,
-            }
+            {**_BASE_SEG, "duration_sec": duration_sec, ts_field: ts_value, "mapmatch_conf": conf},
         ],
     }
 
     response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
+    # Deprecated timestamp_utc is accepted (with a deprecation warning logged)
     assert response.status_code == 200
     data = response.json()
 
     # v1 spec fields
-    assert "accepted_segments" in data
-    assert "rejected_segments" in data
+    assert data["accepted_segments"] == 1
+    assert data["rejected_segments"] == 0
     assert "rejected_by_reason" in data
 
     # Old fields should NOT be present
@@ -206,27 +163,27 @@ def test_post_response_has_accepted_segments_field(client, auth_headers):
     assert "rejected_count" not in data
 
 
-def test_post_response_counts_rejections_correctly(client, auth_headers):
-    """Test POST response counts accepted and rejected segments correctly."""
-    setup_test_segment(client)
+# ==============================================================================
+# POST /v1/ride_summary - Response Schema Tests
+# ==============================================================================
+
 
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+def test_post_response_counts_rejections_correctly(client, post_headers, seeded_segment):
+    """Test POST response counts accepted and rejected segments correctly."""
+    observed_at = _utc_now_iso()
 
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "e" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_E,
         "segments": [
             {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
+                **_BASE_SEG,
                 "duration_sec": 320.0,
                 "observed_at_utc": observed_at,
                 "mapmatch_conf": 0.95,  # High confidence
             },
             {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
+                **_BASE_SEG,
                 "duration_sec": 325.0,
                 "observed_at_utc": observed_at,
                 "mapmatch_conf": 0.5,  # Low confidence (< 0.7 default)
@@ -236,8 +193,8 @@ def test_post_response_counts_rejections_correctly(client, auth_headers):
 
     response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert response.status_code == 200
@@ -252,121 +209,93 @@ def test_post_response_counts_rejections_correctly(client, auth_headers):
 # ==============================================================================
 
 
-def test_post_rejects_future_timestamp(client, auth_headers):
+def test_post_rejects_future_timestamp(client, post_headers, seeded_segment):
     """Test POST rejects future timestamp."""
-    setup_test_segment(client)
-
-    # Create timestamp 1 hour in the future
-    future_time = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat().replace("+00:00", "Z")
-
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "f" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_F,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": future_time,
-                "mapmatch_conf": 0.95,
-            }
+            {**_BASE_SEG, "duration_sec": 300.0, "observed_at_utc": _FUTURE_ISO},
         ],
     }
 
     response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert response.status_code == 422  # Unprocessable
 
 
-def test_post_rejects_stale_timestamp(client, auth_headers):
+def test_post_rejects_stale_timestamp(client, post_headers, seeded_segment):
     """Test POST rejects timestamp >7 days old."""
-    setup_test_segment(client)
-
-    # Create timestamp 8 days ago
-    stale_time = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat().replace("+00:00", "Z")
-
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "1" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_1,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": stale_time,
-                "mapmatch_conf": 0.95,
-            }
+            {**_BASE_SEG, "duration_sec": 300.0, "observed_at_utc": _STALE_ISO},
         ],
     }
 
     response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert response.status_code == 422  # Unprocessable
 
 
-def test_post_rejects_invalid_iso8601_format(client, auth_headers):
-    """Test POST rejects invalid ISO-8601 format."""
-    setup_test_segment(client)
-
+@pytest.mark.parametrize(
+    "observed_at",
+    [
+        pytest.param("not-a-valid-timestamp", id="free_text"),
+        pytest.param("", id="empty"),
+        pytest.param("2025-13-01T00:00:00Z", id="month_13"),
+        pytest.param("2025-01-01T25:00:00Z", id="hour_25"),
+        pytest.param("2025-02-30T00:00:00Z", id="feb_30"),
+    ],
+)
+def test_post_rejects_invalid_iso8601_format(module_client, post_headers, observed_at):
+    """Test POST rejects invalid ISO-8601 format.
+
+    Validation fails before any database lookup, so these share the module
+    database and need no seeded segment.
+    """
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "2" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_2,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": "not-a-valid-timestamp",
-                "mapmatch_conf": 0.95,
-            }
+            {**_BASE_SEG, "duration_sec": 300.0, "observed_at_utc": observed_at},
         ],
     }
 
-    response = client.post(
+    response = module_client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert response.status_code == 422  # Unprocessable
 
 
-def test_post_rejects_invalid_device_bucket_format(client, auth_headers):
+def test_post_rejects_invalid_device_bucket_format(client, post_headers, seeded_segment):
     """Test POST rejects invalid device_bucket format (not 64-char hex)."""
-    setup_test_segment(client)
-
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    observed_at = _utc_now_iso()
 
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
+        **_BASE_RIDE,
         "device_bucket": "invalid-bucket",  # Not 64-char hex
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 300.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
+            {**_BASE_SEG, "duration_sec": 300.0, "observed_at_utc": observed_at},
         ],
     }
 
     response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert response.status_code == 422  # Unprocessable
@@ -377,45 +306,36 @@ def test_post_rejects_invalid_device_bucket_format(client, auth_headers):
 # ==============================================================================
 
 
-def test_get_eta_response_has_v1_fields(client, auth_headers):
-    """Test GET /v1/eta response has all v1 spec fields."""
-    setup_test_segment(client)
+@pytest.fixture(scope="module")
+def eta_response(module_client, post_headers, module_seeded_segment) -> dict:
+    """Submit one ride, then fetch the ETA once per module for the schema tests.
 
-    # First submit a ride to create stats
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    The tests below only inspect different fields of the same /v1/eta
+    payload, so they share one POST and one GET on the module database.
+    """
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "3" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_3,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 320.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
+            {**_BASE_SEG, "duration_sec": 320.0, "observed_at_utc": _utc_now_iso()},
         ],
     }
-    client.post(
+    response = module_client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
+    assert response.status_code == 200
 
-    # Query ETA
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
+    response = module_client.get("/v1/eta", params=ETA_PARAMS)
 
     assert response.status_code == 200
-    data = response.json()
+    return response.json()
+
+
+def test_get_eta_response_has_v1_fields(eta_response):
+    """Test GET /v1/eta response has all v1 spec fields."""
+    data = eta_response
 
     # v1 spec fields
     assert "eta_sec" in data
@@ -434,105 +354,36 @@ def test_get_eta_response_has_v1_fields(client, auth_headers):
     assert "low_n_warning" not in data
 
     # Verify types
-    assert isinstance(data["eta_sec"], (int, float))
+    assert isinstance(data["eta_sec"], _NUM)
     assert isinstance(data["n"], int)
     assert isinstance(data["low_confidence"], bool)
     assert isinstance(data["bin_id"], int)
     assert isinstance(data["last_updated"], str)
-    assert isinstance(data["schedule_sec"], (int, float))
+    assert isinstance(data["schedule_sec"], _NUM)
 
 
-def test_get_eta_last_updated_is_iso8601(client, auth_headers):
+def test_get_eta_last_updated_is_iso8601(eta_response):
     """Test GET /v1/eta returns last_updated as ISO-8601 string."""
-    setup_test_segment(client)
-
-    # Submit a ride
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "4" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 315.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.92,
-            }
-        ],
-    }
-    client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
-
-    # Query ETA
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-
     # Verify last_updated is ISO-8601 string
-    last_updated = data["last_updated"]
+    last_updated = eta_response["last_updated"]
     assert isinstance(last_updated, str)
     assert "T" in last_updated
     assert last_updated.endswith("Z")
 
     # Verify it can be parsed as ISO-8601
-    parsed = datetime.fromisoformat(last_updated.replace("Z", "+00:00"))
+    parsed = _parse_iso(last_updated)
     assert parsed.tzinfo is not None
 
 
-def test_get_eta_bin_id_in_valid_range(client, auth_headers):
+def test_get_eta_bin_id_in_valid_range(eta_response):
     """Test GET /v1/eta returns bin_id in valid range (0-191)."""
-    setup_test_segment(client)
+    assert eta_response["bin_id"] in range(192)  # 192 bins total (0-191)
 
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
 
-    assert response.status_code == 200
-    data = response.json()
-
-    bin_id = data["bin_id"]
-    assert 0 <= bin_id <= 191  # 192 bins total (0-191)
-
-
-def test_get_eta_schedule_sec_is_present(client, auth_headers):
+def test_get_eta_schedule_sec_is_present(eta_response):
     """Test GET /v1/eta includes schedule_sec field."""
-    setup_test_segment(client)
-
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-
-    assert "schedule_sec" in data
-    assert data["schedule_sec"] == 300.0  # From setup_test_segment
+    assert "schedule_sec" in eta_response
+    assert eta_response["schedule_sec"] == 300.0  # From module_seeded_segment
 
 
 # ==============================================================================
@@ -540,31 +391,22 @@ def test_get_eta_schedule_sec_is_present(client, auth_headers):
 # ==============================================================================
 
 
-def test_full_flow_post_then_get_with_v1_schema(client, auth_headers):
+def test_full_flow_post_then_get_with_v1_schema(client, post_headers, seeded_segment):
     """Test complete flow: POST with v1 schema -> GET with v1 schema."""
-    setup_test_segment(client)
-
     # Step 1: Submit ride with v1 schema
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    observed_at = _utc_now_iso()
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "5" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_5,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 330.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.96,
-            }
+            {**_BASE_SEG, "duration_sec": 330.0, "observed_at_utc": observed_at, "mapmatch_conf": 0.96},
         ],
     }
 
     post_response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert post_response.status_code == 200
@@ -598,41 +440,24 @@ def test_full_flow_post_then_get_with_v1_schema(client, auth_headers):
     assert get_data["n"] >= 1
 
 
-def test_multiple_segments_with_v1_schema(client, auth_headers):
+def test_multiple_segments_with_v1_schema(client, post_headers, seeded_segment):
     """Test POST with multiple segments using v1 schema."""
-    setup_test_segment(client)
-
-    observed_at_1 = (datetime.now(timezone.utc) - timedelta(minutes=10)).isoformat().replace("+00:00", "Z")
-    observed_at_2 = (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat().replace("+00:00", "Z")
+    observed_at_1 = _utc_iso(timedelta(minutes=-10))
+    observed_at_2 = _utc_iso(timedelta(minutes=-5))
 
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "6" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_6,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 310.0,
-                "dwell_sec": 20.0,
-                "observed_at_utc": observed_at_1,
-                "mapmatch_conf": 0.94,
-            },
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 315.0,
-                "dwell_sec": 25.0,
-                "observed_at_utc": observed_at_2,
-                "mapmatch_conf": 0.91,
-            },
+            {**_BASE_SEG, "duration_sec": 310.0, "dwell_sec": 20.0, "observed_at_utc": observed_at_1, "mapmatch_conf": 0.94},
+            {**_BASE_SEG, "duration_sec": 315.0, "dwell_sec": 25.0, "observed_at_utc": observed_at_2, "mapmatch_conf": 0.91},
         ],
     }
 
     response = client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     assert response.status_code == 200
@@ -646,34 +471,25 @@ def test_multiple_segments_with_v1_schema(client, auth_headers):
 # ==============================================================================
 
 
-def test_get_eta_accepts_when_parameter(client, auth_headers):
+def test_get_eta_accepts_when_parameter(client, post_headers, seeded_segment):
     """Test GET /v1/eta accepts 'when' parameter (ISO-8601 string)."""
-    setup_test_segment(client)
-
     # Submit a ride first
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    observed_at = _utc_now_iso()
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "7" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_7,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 320.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
+            {**_BASE_SEG, "duration_sec": 320.0, "observed_at_utc": observed_at},
         ],
     }
     client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     # Query ETA with 'when' parameter (ISO-8601)
-    when_time = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat().replace("+00:00", "Z")
+    when_time = _utc_iso(timedelta(hours=-1))
     response = client.get(
         "/v1/eta",
         params={
@@ -691,30 +507,21 @@ def test_get_eta_accepts_when_parameter(client, auth_headers):
     assert "bin_id" in data
 
 
-def test_get_eta_backward_compat_timestamp_utc(client, auth_headers):
+def test_get_eta_backward_compat_timestamp_utc(client, post_headers, seeded_segment):
     """Test GET /v1/eta still accepts deprecated 'timestamp_utc' parameter."""
-    setup_test_segment(client)
-
     # Submit a ride first
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    observed_at = _utc_now_iso()
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "8" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_8,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 315.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.92,
-            }
+            {**_BASE_SEG, "duration_sec": 315.0, "observed_at_utc": observed_at, "mapmatch_conf": 0.92},
         ],
     }
     client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     # Query ETA with deprecated 'timestamp_utc' parameter (epoch int)
@@ -725,7 +532,7 @@ def test_get_eta_backward_compat_timestamp_utc(client, auth_headers):
             "direction_id": 0,
             "from_stop_id": "STOP_A",
             "to_stop_id": "STOP_B",
-            "timestamp_utc": int(time.time()) - 3600,  # 1 hour ago
+            "timestamp_utc": _ONE_HOUR_AGO,
         },
     )
 
@@ -735,34 +542,25 @@ def test_get_eta_backward_compat_timestamp_utc(client, auth_headers):
     assert "bin_id" in data
 
 
-def test_get_eta_when_takes_precedence_over_timestamp_utc(client, auth_headers):
+def test_get_eta_when_takes_precedence_over_timestamp_utc(client, post_headers, seeded_segment):
     """Test that 'when' parameter takes precedence if both provided."""
-    setup_test_segment(client)
-
     # Submit a ride first
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    observed_at = _utc_now_iso()
     ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "9" * 64,
+        **_BASE_RIDE,
+        "device_bucket": _BUCKET_9,
         "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 310.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.94,
-            }
+            {**_BASE_SEG, "duration_sec": 310.0, "observed_at_utc": observed_at, "mapmatch_conf": 0.94},
         ],
     }
     client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
+        content=orjson.dumps(ride_data),
+        headers=_with_idem_key(post_headers),
     )
 
     # Provide both parameters - 'when' should take precedence
-    when_time = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat().replace("+00:00", "Z")
+    when_time = _utc_iso(timedelta(hours=-2))
     response = client.get(
         "/v1/eta",
         params={
@@ -771,7 +569,7 @@ def test_get_eta_when_takes_precedence_over_timestamp_utc(client, auth_headers):
             "from_stop_id": "STOP_A",
             "to_stop_id": "STOP_B",
             "when": when_time,
-            "timestamp_utc": int(time.time()) - 3600,  # Different time
+            "timestamp_utc": _ONE_HOUR_AGO,  # Different time
         },
     )
 
@@ -782,10 +580,8 @@ def test_get_eta_when_takes_precedence_over_timestamp_utc(client, auth_headers):
     # but the request should succeed
 
 
-def test_get_eta_defaults_to_now_when_no_time_provided(client, auth_headers):
+def test_get_eta_defaults_to_now_when_no_time_provided(client, auth_headers, seeded_segment):
     """Test GET /v1/eta defaults to server 'now' when neither parameter provided."""
-    setup_test_segment(client)
-
     # Query ETA without any time parameter
     response = client.get(
         "/v1/eta",
@@ -821,9 +617,9 @@ def test_get_config_has_all_spec_fields(client):
         "n0": int,
         "time_bin_minutes": int,
         "half_life_days": int,
-        "ema_alpha": (int, float),
-        "outlier_sigma": (int, float),
-        "mapmatch_min_conf": (int, float),
+        "ema_alpha": _NUM,
+        "outlier_sigma": _NUM,
+        "mapmatch_min_conf": _NUM,
         "max_segments_per_ride": int,
         "rate_limit_per_hour": int,
         "idempotency_ttl_hours": int,
@@ -942,19 +738,13 @@ def test_get_health_always_returns_200(client):
 # ==============================================================================
 
 
-def test_post_ride_summary_rejects_malformed_json(client, auth_headers):
+def test_post_ride_summary_rejects_malformed_json(client, post_headers, seeded_segment):
     """Test POST /v1/ride_summary returns 400 for malformed JSON."""
-    setup_test_segment(client)
-
     # Send malformed JSON (missing closing quote)
     response = client.post(
         "/v1/ride_summary",
-        data='{"route_id": "ROUTE1", "direction_id": 0',  # Invalid JSON
-        headers={
-            **auth_headers,
-            "Content-Type": "application/json",
-            "Idempotency-Key": str(uuid4()),
-        },
+        content=b'{"route_id": "ROUTE1", "direction_id": 0',  # Invalid JSON
+        headers=_with_idem_key(post_headers),
     )
 
     # Should return 400 Bad Request for malformed JSON
@@ -967,57 +757,45 @@ def test_post_ride_summary_rejects_malformed_json(client, auth_headers):
 # ==============================================================================
 
 
-def test_all_endpoints_return_x_api_version_header(client, auth_headers):
+@pytest.mark.parametrize(
+    "method, url, params, body",
+    [
+        pytest.param("GET", "/v1/health", None, None, id="health"),
+        pytest.param("GET", "/v1/config", None, None, id="config"),
+        pytest.param(
+            "GET",
+            "/v1/eta",
+            ETA_PARAMS,
+            None,
+            id="eta",
+        ),
+        pytest.param(
+            "POST",
+            "/v1/ride_summary",
+            None,
+            {
+                **_BASE_RIDE,
+                "device_bucket": _BUCKET_A,
+                "segments": [
+                    {**_BASE_SEG, "duration_sec": 320.0, "observed_at_utc": _utc_iso(timedelta())},
+                ],
+            },
+            id="ride_summary",
+        ),
+    ],
+)
+def test_all_endpoints_return_x_api_version_header(client, post_headers, seeded_segment, method, url, params, body):
     """Test that all endpoints return X-API-Version: 1 header."""
-    setup_test_segment(client)
-
-    # Test GET /v1/health
-    response = client.get("/v1/health")
-    assert response.status_code == 200
-    assert "X-API-Version" in response.headers
-    assert response.headers["X-API-Version"] == "1"
-
-    # Test GET /v1/config
-    response = client.get("/v1/config")
-    assert response.status_code == 200
-    assert "X-API-Version" in response.headers
-    assert response.headers["X-API-Version"] == "1"
-
-    # Test GET /v1/eta
-    response = client.get(
-        "/v1/eta",
-        params={
-            "route_id": "ROUTE1",
-            "direction_id": 0,
-            "from_stop_id": "STOP_A",
-            "to_stop_id": "STOP_B",
-        },
-    )
-    assert response.status_code == 200
-    assert "X-API-Version" in response.headers
-    assert response.headers["X-API-Version"] == "1"
+    if body is None:
+        response = client.request(method, url, params=params)
+    else:
+        response = client.request(
+            method,
+            url,
+            content=orjson.dumps(body),
+            headers=_with_idem_key(post_headers),
+        )
 
-    # Test POST /v1/ride_summary
-    observed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    ride_data = {
-        "route_id": "ROUTE1",
-        "direction_id": 0,
-        "device_bucket": "a" * 64,
-        "segments": [
-            {
-                "from_stop_id": "STOP_A",
-                "to_stop_id": "STOP_B",
-                "duration_sec": 320.0,
-                "observed_at_utc": observed_at,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
-    response = client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers={**auth_headers, "Idempotency-Key": str(uuid4())},
-    )
     assert response.status_code == 200
     assert "X-API-Version" in response.headers
     assert response.headers["X-API-Version"] == "1"
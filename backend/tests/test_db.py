@@ -0,0 +1,125 @@
+"""Unit tests for database initialization and hot-path query plans.
+
+Uses isolated fixtures from conftest.py.
+"""
+
+import time
+
+import pytest
+
+# Mark all tests in this module as unit tests
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def initialized_db(temp_db):
+    """Provide database initialized through init_db (schema + time bins + ANALYZE)."""
+    from app.db import get_connection, init_db
+
+    db_path, _ = temp_db
+    init_db(db_path)
+    conn = get_connection(db_path)
+    yield conn
+    conn.close()
+
+
+def _query_plan(conn, sql: str, params: tuple) -> str:
+    """Return EXPLAIN QUERY PLAN detail lines joined into one string."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " | ".join(row["detail"] for row in rows)
+
+
+def test_init_db_collects_planner_statistics(initialized_db):
+    """Test that init_db runs ANALYZE (sqlite_stat1 exists)."""
+    row = initialized_db.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone()
+    assert row is not None
+
+
+def test_segment_lookup_uses_unique_index(initialized_db):
+    """Test that the 4-tuple segment lookup is a unique-index probe."""
+    plan = _query_plan(
+        initialized_db,
+        "SELECT segment_id FROM segments "
+        "WHERE route_id = ? AND direction_id = ? AND from_stop_id = ? AND to_stop_id = ?",
+        ("R", 0, "A", "B"),
+    )
+    assert "sqlite_autoindex_segments" in plan
+    assert "SCAN" not in plan
+
+
+def test_idempotency_lookup_probes_primary_key(initialized_db):
+    """Test that the TTL-filtered key lookup is a single primary-key probe."""
+    plan = _query_plan(
+        initialized_db,
+        "SELECT submitted_at, response_hash, body_hash FROM idempotency_keys "
+        "WHERE key = ? AND submitted_at >= ?",
+        ("key", int(time.time())),
+    )
+    assert "USING INDEX sqlite_autoindex_idempotency_keys_1 (key=?)" in plan
+    assert "SCAN" not in plan
+
+
+def test_idempotency_cleanup_uses_submitted_at_index(initialized_db):
+    """Test that the TTL cleanup DELETE is a range search on submitted_at."""
+    plan = _query_plan(
+        initialized_db,
+        "DELETE FROM idempotency_keys WHERE submitted_at < ?",
+        (int(time.time()),),
+    )
+    assert "USING INDEX idx_idempotency_submitted" in plan
+    assert "SCAN" not in plan
+
+
+def test_segment_stats_lookup_uses_primary_key(initialized_db):
+    """Test that the (segment_id, bin_id) stats lookup is a primary-key probe."""
+    plan = _query_plan(
+        initialized_db,
+        "SELECT n, welford_mean, welford_m2 FROM segment_stats "
+        "WHERE segment_id = ? AND bin_id = ?",
+        (1, 0),
+    )
+    assert "SEARCH segment_stats" in plan
+    assert "SCAN" not in plan
+
+
+def test_stats_prefetch_probes_primary_key(initialized_db):
+    """Test that prefetch_segment_stats reads only the requested keys, by primary key."""
+    from app.learning import prefetch_segment_stats
+
+    initialized_db.execute(
+        "INSERT INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES ('R', 0, 'A', 'B')"
+    )
+    initialized_db.executemany(
+        "INSERT INTO segment_stats (segment_id, bin_id, schedule_mean) VALUES (1, ?, 300.0)",
+        [(0,), (1,)],
+    )
+
+    statements = []
+    initialized_db.set_trace_callback(statements.append)
+    stats = prefetch_segment_stats(initialized_db, [(1, 0), (1, 0), (1, 5)])
+    initialized_db.set_trace_callback(None)
+
+    assert list(stats) == [(1, 0)]  # (1, 5) has no row
+    assert stats[(1, 0)][5] == 300.0  # schedule_mean
+
+    # The traced statement has its parameters inlined
+    plan = _query_plan(initialized_db, statements[-1], ())
+    assert "SEARCH ss USING INDEX sqlite_autoindex_segment_stats_1" in plan
+    assert "SCAN ss" not in plan
+
+
+def test_thread_connection_is_reused_until_closed(temp_db):
+    """Test that get_thread_connection reuses one connection per thread and path."""
+    import sqlite3
+    from app.db import close_thread_connections, get_thread_connection
+
+    db_path, _ = temp_db
+    conn = get_thread_connection(db_path)
+    assert get_thread_connection(db_path) is conn
+
+    close_thread_connections()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert get_thread_connection(db_path) is not conn
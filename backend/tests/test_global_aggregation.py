@@ -7,75 +7,124 @@ Tests the global aggregation system including:
 - Outlier detection and rejection
 - Rejection reason breakdown
 
-All tests use isolated fixtures from conftest.py.
+Ride tests share one module database, restored from a seeded template
+before each test; other tests use isolated fixtures from conftest.py.
 """
 
+import sqlite3
 import time
+
+import orjson
 import pytest
 
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
 
-@pytest.fixture
-def global_agg_client(client):
-    """Provide client with test segment setup for global aggregation tests."""
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-
-    # Insert segment
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE_GLOBAL", 0, "STOP_X", "STOP_Y"),
-    )
-    conn.commit()
+@pytest.fixture(scope="module")
+def global_agg_template(initialized_template):
+    """Provide an in-memory copy of the initialized database with the test segment seeded.
+
+    Built once per module; global_agg_client page-copies it into the module
+    database before each test instead of re-running the seed inserts.
+    """
+    template = sqlite3.connect(":memory:")
+    initialized_template.backup(template)
+
+    with template:
+        cursor = template.execute(
+            "INSERT INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
+            ("ROUTE_GLOBAL", 0, "STOP_X", "STOP_Y"),
+        )
+        # Insert segment_stats for bin 0 with baseline
+        template.execute(
+            """
+            INSERT INTO segment_stats (
+                segment_id, bin_id, schedule_mean, n, welford_mean, welford_m2
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (cursor.lastrowid, 0, 300.0, 0, 0.0, 0.0),
+        )
+
+    yield template
+
+    template.close()
 
-    # Get segment_id
-    cursor.execute(
+
+@pytest.fixture(scope="module")
+def global_agg_segment_id(global_agg_template) -> int:
+    """Return the seeded ROUTE_GLOBAL segment's id, looked up once per module."""
+    return global_agg_template.execute(
         "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
         ("ROUTE_GLOBAL", 0, "STOP_X", "STOP_Y"),
-    )
-    segment_id = cursor.fetchone()[0]
+    ).fetchone()[0]
 
-    # Insert segment_stats for bin 0 with baseline
-    cursor.execute(
-        """
-        INSERT OR IGNORE INTO segment_stats (
-            segment_id, bin_id, schedule_mean, n, welford_mean, welford_m2
-        ) VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (segment_id, 0, 300.0, 0, 0.0, 0.0),
-    )
-    conn.commit()
-    conn.close()
 
-    yield client
+@pytest.fixture
+def global_agg_client(module_client, module_db, global_agg_template):
+    """Provide the module client with its database reset to the seeded template.
+
+    The module database and client are set up once; each test only page-copies
+    the template back over the rides, stats and device buckets the previous
+    test wrote.
+    """
+    _, conn = module_db
+    global_agg_template.backup(conn)
+
+    return module_client
 
 
-def test_idempotency_header_handling(global_agg_client, auth_headers):
+@pytest.fixture
+def global_agg_db(module_db):
+    """Provide the module database's already-open fixture connection.
+
+    Tests read and adjust state through it instead of opening and closing a
+    get_connection() for every query.
+    """
+    _, conn = module_db
+    return conn
+
+
+# Fields shared by every ride body in this module; builders overlay the rest
+_BASE_RIDE = {"route_id": "ROUTE_GLOBAL", "direction_id": 0}
+_BASE_SEG = {
+    "from_stop_id": "STOP_X",
+    "to_stop_id": "STOP_Y",
+    "duration_sec": 300.0,
+    "mapmatch_conf": 0.90,
+}
+
+
+def _segment(**overrides) -> dict:
+    """Build a STOP_X -> STOP_Y segment that passes validation, with overrides."""
+    return {**_BASE_SEG, "timestamp_utc": int(time.time()), **overrides}
+
+
+def _ride(*segments: dict, **overrides) -> dict:
+    """Build a ROUTE_GLOBAL ride_summary body (one default segment if none given)."""
+    return {**_BASE_RIDE, "segments": list(segments) or [_segment()], **overrides}
+
+
+# 51 segments (exceeds max of 50), serialized once at import
+OVERSIZED_PAYLOAD = orjson.dumps(
+    _ride(*(_segment(timestamp_utc=int(time.time()) - i) for i in range(51)))
+)
+
+
+def _bin_n(conn, segment_id: int, bin_id: int) -> int:
+    """Return a segment's n for a bin (0 when the bin has no row)."""
+    row = conn.execute(
+        "SELECT n FROM segment_stats WHERE segment_id=? AND bin_id=?",
+        (segment_id, bin_id),
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def test_idempotency_header_handling(global_agg_client, global_agg_db, auth_headers):
     """Test that Idempotency-Key header stores keys."""
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 310.0,
-                "timestamp_utc": int(time.time()) - 100,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
+    ride_data = _ride(
+        _segment(duration_sec=310.0, timestamp_utc=int(time.time()) - 100, mapmatch_conf=0.95)
+    )
 
     # First request with idempotency key
     headers = {**auth_headers, "Idempotency-Key": "test-idem-key-unique-001"}
@@ -87,41 +136,24 @@ def test_idempotency_header_handling(global_agg_client, auth_headers):
     assert response1.status_code == 200
 
     # Check that idempotency key was stored
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
+    row = global_agg_db.execute(
         "SELECT key FROM idempotency_keys WHERE key=?", ("test-idem-key-unique-001",)
-    )
-    row = cursor.fetchone()
-    conn.close()
-
-    assert row is not None
-    assert row[0] == "test-idem-key-unique-001"
-
-
-def test_device_bucket_tracking(global_agg_client, auth_headers):
-    """Test that device buckets are created and tracked."""
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-
-    # Submit ride with device_bucket (SHA256 hash) at top level
-    test_bucket = "a" * 64  # Valid SHA256 hex string
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "device_bucket": test_bucket,  # Top-level per v1 spec
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 305.0,
-                "timestamp_utc": int(time.time()) - 200,
-                "mapmatch_conf": 0.85,
-            }
-        ],
-    }
+    ).fetchone()
+
+    assert row == ("test-idem-key-unique-001",)
+
+
+@pytest.mark.parametrize(
+    "segment_count",
+    [1, 3],
+    ids=["new_bucket", "one_observation_per_segment"],
+)
+def test_device_bucket_observation_count(
+    global_agg_client, global_agg_db, auth_headers, segment_count
+):
+    """Test that a ride creates its device bucket, crediting one observation per segment."""
+    test_bucket = "c" * 64  # Valid SHA256 hex string
+    ride_data = _ride(*[_segment()] * segment_count, device_bucket=test_bucket)
 
     response = global_agg_client.post(
         "/v1/ride_summary",
@@ -129,93 +161,52 @@ def test_device_bucket_tracking(global_agg_client, auth_headers):
         headers=auth_headers,
     )
     assert response.status_code == 200
+    assert response.json()["device_bucket_observation_count"] == segment_count
 
-    # Check device_buckets table
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
+    count = global_agg_db.execute(
         "SELECT observation_count FROM device_buckets WHERE bucket_id=?", (test_bucket,)
-    )
-    row = cursor.fetchone()
-    conn.close()
+    ).fetchone()[0]
 
-    assert row is not None
-    assert row[0] >= 1  # Should have at least 1 observation
+    assert count == segment_count
 
 
-def test_device_bucket_persistence(global_agg_client, auth_headers):
+def test_device_bucket_persistence(
+    global_agg_client, auth_headers, post_concurrently, monkeypatch
+):
     """Test that device buckets persist across multiple requests."""
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-    test_bucket = "b" * 64  # Valid SHA256 hex string
-
-    # Submit first ride with device_bucket at top level
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "device_bucket": test_bucket,  # Top-level per v1 spec
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 300.0,
-                "timestamp_utc": int(time.time()),
-                "mapmatch_conf": 0.90,
-            }
-        ],
-    }
-
-    global_agg_client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers=auth_headers,
-    )
+    import app.writer
 
-    # Check observation count
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT observation_count FROM device_buckets WHERE bucket_id=?", (test_bucket,)
-    )
-    count1 = cursor.fetchone()[0]
-    conn.close()
+    ride_data = _ride(device_bucket="b" * 64)  # Top-level per v1 spec
 
-    # Submit second ride with same bucket
-    global_agg_client.post(
-        "/v1/ride_summary",
-        json=ride_data,
-        headers=auth_headers,
-    )
+    batch_sizes = []
+    write_batch = app.writer.write_batch
 
-    # Count should increment
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT observation_count FROM device_buckets WHERE bucket_id=?", (test_bucket,)
-    )
-    count2 = cursor.fetchone()[0]
-    conn.close()
+    def recording_write_batch(path, jobs):
+        batch_sizes.append(len(jobs))
+        return write_batch(path, jobs)
+
+    monkeypatch.setattr(app.writer, "write_batch", recording_write_batch)
 
-    assert count2 > count1
+    # Submit the same bucket twice, concurrently
+    responses = post_concurrently([("/v1/ride_summary", ride_data, auth_headers)] * 2)
+    assert [response.status_code for response in responses] == [200, 200]
+
+    # Both rides share one group commit, which applies them one job at a time,
+    # so the rides report 1 and 2 in some order
+    assert batch_sizes == [2]
+    counts = sorted(response.json()["device_bucket_observation_count"] for response in responses)
+    assert counts == [1, 2]
 
 
 def test_low_mapmatch_conf_rejection(global_agg_client, auth_headers):
     """Test that segments with low mapmatch_conf are rejected."""
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 310.0,
-                "timestamp_utc": int(time.time()) - 300,
-                "mapmatch_conf": 0.5,  # Below threshold of 0.7
-            }
-        ],
-    }
+    ride_data = _ride(
+        _segment(
+            duration_sec=310.0,
+            timestamp_utc=int(time.time()) - 300,
+            mapmatch_conf=0.5,  # Below threshold of 0.7
+        )
+    )
 
     response = global_agg_client.post(
         "/v1/ride_summary",
@@ -229,51 +220,35 @@ def test_low_mapmatch_conf_rejection(global_agg_client, auth_headers):
         assert "low_mapmatch_conf" in result["rejected_by_reason"]
 
 
-def test_outlier_rejection(global_agg_client, auth_headers):
+def test_outlier_rejection(
+    global_agg_client, global_agg_db, global_agg_segment_id, auth_headers
+):
     """Test that outlier detection works when sufficient data exists."""
-    from app.config import get_settings
-    from app.db import compute_bin_id, get_connection
-
-    settings = get_settings()
+    from app.db import compute_bin_id
 
     # Get current timestamp bin
     timestamp = int(time.time()) - 400
     bin_id = compute_bin_id(timestamp)
 
-    # First, populate segment with some normal observations for the specific bin
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE_GLOBAL", 0, "STOP_X", "STOP_Y"),
-    )
-    segment_id = cursor.fetchone()[0]
-
-    # Update segment_stats for the specific bin with n=10, welford_mean=300, welford_m2=1000 (std ~10)
-    cursor.execute(
+    # First, populate segment with some normal observations for the specific bin:
+    # n=10, welford_mean=300, welford_m2=1000 (std ~10)
+    global_agg_db.execute(
         """
         INSERT OR REPLACE INTO segment_stats (segment_id, bin_id, n, welford_mean, welford_m2, schedule_mean)
         VALUES (?, ?, 10, 300.0, 1000.0, 300.0)
         """,
-        (segment_id, bin_id),
+        (global_agg_segment_id, bin_id),
     )
-    conn.commit()
-    conn.close()
+    global_agg_db.commit()
 
     # Submit outlier (3 sigma = 30, so >330 or <270 is outlier)
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 400.0,  # Way above mean
-                "timestamp_utc": timestamp,
-                "mapmatch_conf": 0.95,
-            }
-        ],
-    }
+    ride_data = _ride(
+        _segment(
+            duration_sec=400.0,  # Way above mean
+            timestamp_utc=timestamp,
+            mapmatch_conf=0.95,
+        )
+    )
 
     response = global_agg_client.post(
         "/v1/ride_summary",
@@ -290,60 +265,43 @@ def test_outlier_rejection(global_agg_client, auth_headers):
         )
 
 
-def test_max_segments_validation(global_agg_client, auth_headers):
-    """Test that requests exceeding max segments are rejected."""
-    # Create 51 segments (exceeds max of 50)
-    segments = []
-    for i in range(51):
-        segments.append(
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 300.0,
-                "timestamp_utc": int(time.time()) - i,
-                "mapmatch_conf": 0.90,
-            }
-        )
+def test_max_segments_validation(global_agg_client, auth_headers, monkeypatch):
+    """Test that requests exceeding max segments are rejected before the writer."""
+    import app.writer
+
+    batches = []
+    write_batch = app.writer.write_batch
+
+    def recording_write_batch(path, jobs):
+        batches.append(jobs)
+        return write_batch(path, jobs)
 
-    ride_data = {"route_id": "ROUTE_GLOBAL", "direction_id": 0, "segments": segments}
+    monkeypatch.setattr(app.writer, "write_batch", recording_write_batch)
 
     response = global_agg_client.post(
         "/v1/ride_summary",
-        json=ride_data,
-        headers=auth_headers,
+        content=OVERSIZED_PAYLOAD,
+        headers={
+            **auth_headers,
+            "Content-Type": "application/json",
+            "Idempotency-Key": "test-idem-key-oversized",
+        },
     )
     assert response.status_code == 400
+    # Rejected in the handler: no write transaction was opened for it
+    assert batches == []
 
 
 def test_rejected_by_reason_breakdown(global_agg_client, auth_headers):
     """Test that rejected_by_reason provides accurate breakdown."""
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 310.0,
-                "timestamp_utc": int(time.time()) - 500,
-                "mapmatch_conf": 0.95,
-            },
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 320.0,
-                "timestamp_utc": int(time.time()) - 600,
-                "mapmatch_conf": 0.60,  # Low confidence
-            },
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 330.0,
-                "timestamp_utc": int(time.time()) - 700,
-                # Missing mapmatch_conf (defaults to 1.0)
-            },
-        ],
-    }
+    now = int(time.time())
+    default_conf = _segment(duration_sec=330.0, timestamp_utc=now - 700)
+    del default_conf["mapmatch_conf"]  # Missing mapmatch_conf (defaults to 1.0)
+    ride_data = _ride(
+        _segment(duration_sec=310.0, timestamp_utc=now - 500, mapmatch_conf=0.95),
+        _segment(duration_sec=320.0, timestamp_utc=now - 600, mapmatch_conf=0.60),  # Low confidence
+        default_conf,
+    )
 
     response = global_agg_client.post(
         "/v1/ride_summary",
@@ -364,46 +322,23 @@ def test_rejected_by_reason_breakdown(global_agg_client, auth_headers):
     assert "missing_stats" in reasons or "outlier" in reasons
 
 
-def test_global_aggregation_increments_n(global_agg_client, auth_headers):
+def test_global_aggregation_increments_n(
+    global_agg_client, global_agg_db, global_agg_segment_id, auth_headers
+):
     """Test that accepted segments increment global n counter."""
-    from app.config import get_settings
-    from app.db import compute_bin_id, get_connection
-
-    settings = get_settings()
+    from app.db import compute_bin_id
 
     # Use a specific timestamp
     timestamp = int(time.time()) - 800
     bin_id = compute_bin_id(timestamp)
 
     # Get initial n for the specific bin
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT n FROM segment_stats ss
-        JOIN segments s ON ss.segment_id = s.segment_id
-        WHERE s.route_id=? AND s.direction_id=? AND s.from_stop_id=? AND s.to_stop_id=? AND ss.bin_id=?
-        """,
-        ("ROUTE_GLOBAL", 0, "STOP_X", "STOP_Y", bin_id),
-    )
-    row = cursor.fetchone()
-    initial_n = row[0] if row else 0
-    conn.close()
+    initial_n = _bin_n(global_agg_db, global_agg_segment_id, bin_id)
 
     # Submit valid segment
-    ride_data = {
-        "route_id": "ROUTE_GLOBAL",
-        "direction_id": 0,
-        "segments": [
-            {
-                "from_stop_id": "STOP_X",
-                "to_stop_id": "STOP_Y",
-                "duration_sec": 305.0,
-                "timestamp_utc": timestamp,
-                "mapmatch_conf": 0.92,
-            }
-        ],
-    }
+    ride_data = _ride(
+        _segment(duration_sec=305.0, timestamp_utc=timestamp, mapmatch_conf=0.92)
+    )
 
     response = global_agg_client.post(
         "/v1/ride_summary",
@@ -414,19 +349,7 @@ def test_global_aggregation_increments_n(global_agg_client, auth_headers):
     result = response.json()
 
     # Check n incremented (if accepted)
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT n FROM segment_stats ss
-        JOIN segments s ON ss.segment_id = s.segment_id
-        WHERE s.route_id=? AND s.direction_id=? AND s.from_stop_id=? AND s.to_stop_id=? AND ss.bin_id=?
-        """,
-        ("ROUTE_GLOBAL", 0, "STOP_X", "STOP_Y", bin_id),
-    )
-    row = cursor.fetchone()
-    new_n = row[0] if row else 0
-    conn.close()
+    new_n = _bin_n(global_agg_db, global_agg_segment_id, bin_id)
 
     # If no rejections, n should increment (v1: rejected_segments)
     if result["rejected_segments"] == 0:
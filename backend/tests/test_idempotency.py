@@ -44,29 +44,33 @@ def test_idempotency_key_not_found(idempotency_db):
 
 def test_idempotency_key_store_and_retrieve(idempotency_db):
     """Test storing and retrieving idempotency key."""
-    from app.idempotency import store_idempotency_key, check_idempotency_key, compute_response_hash
+    from app.idempotency import (
+        check_idempotency_key,
+        compute_body_digest,
+        compute_response_digest,
+        store_idempotency_key,
+    )
 
     key = "test-key-456"
+    body = {"route_id": "R1", "segments": []}
     response_data = {"accepted": True, "rejected_count": 2}
 
     # Store key
-    store_idempotency_key(key, response_data)
+    store_idempotency_key(key, body, response_data)
 
     # Retrieve key
     cached = check_idempotency_key(key)
     assert cached is not None
     assert cached["_cached"] is True
-    assert "response_hash" in cached
 
-    # Verify hash matches
-    expected_hash = compute_response_hash(response_data)
-    assert cached["response_hash"] == expected_hash
+    # Stored hashes come back as raw SHA256 digests
+    assert cached["response_hash"] == compute_response_digest(response_data)
+    assert cached["body_hash"] == compute_body_digest(body)
 
 
 def test_idempotency_key_ttl(idempotency_db):
     """Test TTL expiration of idempotency keys."""
     from app.idempotency import check_idempotency_key, compute_response_hash
-    from app.config import get_settings
     from app.db import get_connection
 
     db_path, _ = idempotency_db
@@ -74,8 +78,7 @@ def test_idempotency_key_ttl(idempotency_db):
     response_data = {"accepted": True, "rejected_count": 0}
 
     # Manually insert with old timestamp (2 hours ago)
-    settings = get_settings()
-    conn = get_connection(settings.db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     old_timestamp = int(time.time()) - (2 * 3600)  # 2 hours ago
@@ -92,7 +95,7 @@ def test_idempotency_key_ttl(idempotency_db):
     # But if TTL is 1 hour, this should be expired
     # Let's test with a very old key (25 hours ago)
     key_old = "test-key-very-old"
-    conn = get_connection(settings.db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
     very_old_timestamp = int(time.time()) - (25 * 3600)
     cursor.execute(
@@ -110,21 +113,19 @@ def test_idempotency_key_ttl(idempotency_db):
 def test_cleanup_expired_keys(idempotency_db):
     """Test cleanup of expired idempotency keys."""
     from app.idempotency import cleanup_expired_keys, check_idempotency_key
-    from app.config import get_settings
     from app.db import get_connection
 
     db_path, _ = idempotency_db
-    settings = get_settings()
 
     # Clean all existing keys first
-    conn = get_connection(settings.db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
     cursor.execute("DELETE FROM idempotency_keys")
     conn.commit()
     conn.close()
 
     # Insert 3 keys: 1 recent, 2 expired
-    conn = get_connection(settings.db_path)
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     now = int(time.time())
@@ -160,20 +161,121 @@ def test_idempotency_key_replace(idempotency_db):
     """Test replacing existing idempotency key updates timestamp."""
     from app.idempotency import store_idempotency_key, check_idempotency_key
 
+    db_path, conn = idempotency_db
     key = "replace-key-123"
+    body = {"route_id": "R1", "segments": []}
     response1 = {"accepted": True, "rejected_count": 1}
     response2 = {"accepted": True, "rejected_count": 2}
+    now = int(time.time())
 
     # Store first time
-    store_idempotency_key(key, response1)
+    store_idempotency_key(key, body, response1, now=now)
     cached1 = check_idempotency_key(key)
     hash1 = cached1["response_hash"]
 
-    # Store again with different response (simulates retry with different result)
-    time.sleep(0.1)
-    store_idempotency_key(key, response2)
+    # Store again a second later with a different response (retry with different result)
+    store_idempotency_key(key, body, response2, now=now + 1)
     cached2 = check_idempotency_key(key)
     hash2 = cached2["response_hash"]
 
-    # Hash should be different
+    # Hash should be different and the timestamp refreshed
     assert hash1 != hash2
+    submitted_at = conn.execute(
+        "SELECT submitted_at FROM idempotency_keys WHERE key = ?", (key,)
+    ).fetchone()[0]
+    assert submitted_at == now + 1
+
+
+def test_idempotency_cache_serves_replay_without_db(idempotency_db):
+    """Test that a stored key is answered from the in-process cache."""
+    from app.idempotency import (
+        check_idempotency_key,
+        clear_idempotency_cache,
+        store_idempotency_key,
+    )
+    from app.db import get_connection
+
+    db_path, _ = idempotency_db
+    key = "test-key-cached-321"
+    body = {"route_id": "R1", "segments": []}
+
+    store_idempotency_key(key, body, {"accepted_segments": 0})
+
+    # Remove the row behind the cache's back
+    conn = get_connection(db_path)
+    conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+    conn.commit()
+    conn.close()
+
+    cached = check_idempotency_key(key, body)
+    assert cached is not None
+    assert cached["body_hash_match"] is True
+
+    # Once the cache is dropped the database is authoritative again
+    clear_idempotency_cache()
+    assert check_idempotency_key(key, body) is None
+
+
+def test_cleanup_keeps_live_keys_cached(idempotency_db):
+    """Test that cleanup only evicts cache entries for keys it deleted."""
+    from app.idempotency import (
+        check_idempotency_key,
+        cleanup_expired_keys,
+        store_idempotency_key,
+    )
+    from app.db import get_connection
+
+    db_path, _ = idempotency_db
+    key = "test-key-live-654"
+    body = {"route_id": "R1", "segments": []}
+
+    store_idempotency_key(key, body, {"accepted_segments": 0})
+    assert cleanup_expired_keys() == 0
+
+    # Remove the row behind the cache's back; the entry survived cleanup
+    conn = get_connection(db_path)
+    conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+    conn.commit()
+    conn.close()
+
+    assert check_idempotency_key(key, body)["body_hash_match"] is True
+
+
+def test_cleanup_without_expired_keys_skips_write(idempotency_db):
+    """Test that cleanup with nothing expired never opens a write transaction."""
+    from app.idempotency import cleanup_expired_keys, store_idempotency_key
+    from app.db import get_thread_connection
+
+    db_path, _ = idempotency_db
+    store_idempotency_key("test-key-fresh-987", {"route_id": "R1"}, {"accepted_segments": 0})
+
+    statements = []
+    conn = get_thread_connection(db_path)
+    conn.set_trace_callback(statements.append)
+    try:
+        assert cleanup_expired_keys() == 0
+    finally:
+        conn.set_trace_callback(None)
+
+    assert statements
+    assert not any(sql.lstrip().upper().startswith(("BEGIN", "DELETE")) for sql in statements)
+
+
+def test_uncommitted_key_is_not_cached(idempotency_db):
+    """Test that a key read inside a caller's open transaction stays out of the cache."""
+    from app.idempotency import check_idempotency_key, store_idempotency_key
+    from app.db import get_connection
+
+    db_path, _ = idempotency_db
+    key = "test-key-rolled-back-246"
+    body = {"route_id": "R1", "segments": []}
+
+    conn = get_connection(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    store_idempotency_key(key, body, {"accepted_segments": 0}, conn=conn)
+    assert check_idempotency_key(key, body, conn=conn) is not None
+    conn.rollback()
+    conn.close()
+
+    # The batch never committed, so the key must not be reported as processed
+    assert check_idempotency_key(key, body) is None
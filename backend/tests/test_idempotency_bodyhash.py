@@ -15,7 +15,7 @@ pytestmark = pytest.mark.integration
 
 
 @pytest.fixture
-def setup_segment_for_bodyhash(client):
+def setup_segment_for_bodyhash(client, get_or_create_segment):
     """Setup test segment for body hash tests."""
     from app.config import get_settings
     from app.db import get_connection
@@ -25,18 +25,7 @@ def setup_segment_for_bodyhash(client):
     cursor = conn.cursor()
 
     # Insert test segment
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("TEST_ROUTE", 0, "STOP1", "STOP2"),
-    )
-    conn.commit()
-
-    # Get segment_id and insert baseline stats
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("TEST_ROUTE", 0, "STOP1", "STOP2"),
-    )
-    segment_id = cursor.fetchone()[0]
+    segment_id = get_or_create_segment(conn, "TEST_ROUTE", 0, "STOP1", "STOP2")
 
     # Insert baseline stats for bin 0
     cursor.execute(
@@ -148,7 +137,7 @@ def test_store_idempotency_key_with_body_hash(temp_db):
     assert row is not None
     assert row[0] is not None  # response_hash
     assert row[1] is not None  # body_hash
-    assert len(row[1]) == 64  # SHA256 hex digest
+    assert len(row[1]) == 32  # SHA256 digest stored as BLOB
 
 
 # Integration tests with FastAPI endpoint
@@ -189,7 +178,7 @@ def test_first_submission_stores_body_hash(setup_segment_for_bodyhash, auth_head
 
     assert row is not None
     assert row[0] is not None
-    assert len(row[0]) == 64
+    assert len(row[0]) == 32  # SHA256 digest stored as BLOB
 
 
 def test_replay_with_same_body_succeeds(setup_segment_for_bodyhash, auth_headers):
@@ -434,6 +423,34 @@ def test_body_hash_verification_with_null_stored_hash(setup_segment_for_bodyhash
     assert response.status_code == 200
 
 
+def test_body_hash_verification_with_legacy_stored_hash(temp_db):
+    """Test keys stored with the pre-orjson json.dumps hash still verify on replay."""
+    import hashlib
+    import json
+    from app.idempotency import check_idempotency_key, clear_idempotency_cache
+
+    _, conn = temp_db
+    idempotency_key = str(uuid4())
+    body = {"route_id": "TEST_ROUTE", "direction_id": 0, "stop_name": "ಮೆಜೆಸ್ಟಿಕ್"}
+    legacy_hash = hashlib.sha256(
+        json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+    conn.execute(
+        "INSERT INTO idempotency_keys (key, submitted_at, response_hash, body_hash) VALUES (?, ?, ?, ?)",
+        (idempotency_key, int(time.time()), "dummy_response_hash", legacy_hash),
+    )
+    clear_idempotency_cache()
+
+    cached = check_idempotency_key(idempotency_key, body, conn=conn)
+    assert cached["body_hash_match"] is True
+    # Legacy TEXT rows come back as bytes like BLOB rows (hex decoded, other text encoded)
+    assert cached["body_hash"] == bytes.fromhex(legacy_hash)
+    assert cached["response_hash"] == b"dummy_response_hash"
+    tampered = {**body, "direction_id": 1}
+    assert check_idempotency_key(idempotency_key, tampered, conn=conn)["body_hash_match"] is False
+
+
 # Edge cases
 
 
@@ -18,46 +18,6 @@ from zoneinfo import ZoneInfo
 pytestmark = pytest.mark.integration
 
 
-def setup_test_segment(client):
-    """Helper to setup test segment via database.
-
-    Note: This helper accesses the database directly rather than via API
-    because we need segments to exist before submitting rides.
-    """
-    from app.config import get_settings
-    from app.db import get_connection
-
-    settings = get_settings()
-    conn = get_connection(settings.db_path)
-    cursor = conn.cursor()
-
-    # Insert segment (idempotent)
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-
-    # Get segment_id
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
-
-    # Insert segment_stats for all 192 bins (idempotent)
-    for bin_id in range(192):
-        cursor.execute(
-            """
-            INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean)
-            VALUES (?, ?, ?)
-            """,
-            (segment_id, bin_id, 300.0),  # 5 min schedule baseline
-        )
-
-    conn.commit()
-    conn.close()
-
-
 def test_health_check(client):
     """Test /v1/health endpoint returns ok status."""
     response = client.get("/v1/health")
@@ -82,9 +42,8 @@ def test_auth_required(client):
     assert response.status_code == 401  # No auth header (standardized error format)
 
 
-def test_ride_submission_and_eta(client, auth_headers):
+def test_ride_submission_and_eta(client, auth_headers, seeded_segment):
     """Test complete POST ride -> GET eta integration flow."""
-    setup_test_segment(client)
 
     # Submit ride with v1 schema
     observed_at = (datetime.now(ZoneInfo("UTC")) - timedelta(hours=1)).isoformat().replace("+00:00", "Z")
@@ -136,6 +95,44 @@ def test_ride_submission_and_eta(client, auth_headers):
     assert 0 < eta["blend_weight"] < 0.1
 
 
+def test_repeated_segment_updates_stats_per_observation(
+    client, temp_db, auth_headers, seeded_segment
+):
+    """Test that a ride repeating one segment and bin applies every observation."""
+    from app.db import compute_bin_id
+
+    observed = datetime.now(ZoneInfo("UTC")) - timedelta(hours=1)
+    observed_at = observed.isoformat().replace("+00:00", "Z")
+    durations = [300.0, 310.0, 320.0]
+    ride_data = {
+        "route_id": "ROUTE1",
+        "direction_id": 0,
+        "segments": [
+            {
+                "from_stop_id": "STOP_A",
+                "to_stop_id": "STOP_B",
+                "duration_sec": duration,
+                "observed_at_utc": observed_at,
+            }
+            for duration in durations
+        ],
+    }
+
+    response = client.post("/v1/ride_summary", json=ride_data, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["accepted_segments"] == 3
+
+    _, conn = temp_db
+    n, mean, m2 = conn.execute(
+        "SELECT n, welford_mean, welford_m2 FROM segment_stats WHERE segment_id = ? AND bin_id = ?",
+        (seeded_segment, compute_bin_id(int(observed.timestamp()))),
+    ).fetchone()
+
+    assert n == 3
+    assert mean == pytest.approx(310.0)
+    assert m2 == pytest.approx(200.0)  # sum of squared deviations from 310
+
+
 def test_unknown_segment_rejection(client, auth_headers):
     """Test that unknown segments are rejected with 422."""
     observed_at = datetime.now(ZoneInfo("UTC")).isoformat().replace("+00:00", "Z")
@@ -161,9 +158,50 @@ def test_unknown_segment_rejection(client, auth_headers):
     assert response.status_code == 422
 
 
-def test_holiday_flag_routing(client, auth_headers):
+def test_unknown_segment_rolls_back_whole_ride(client, temp_db, auth_headers, seeded_segment):
+    """Test that a 422 leaves no partial ride, stats or device bucket behind."""
+    observed_at = datetime.now(ZoneInfo("UTC")).isoformat().replace("+00:00", "Z")
+    bucket = "d" * 64
+    ride_data = {
+        "route_id": "ROUTE1",
+        "direction_id": 0,
+        "device_bucket": bucket,
+        "segments": [
+            {
+                "from_stop_id": "STOP_A",
+                "to_stop_id": "STOP_B",
+                "duration_sec": 300.0,
+                "observed_at_utc": observed_at,
+            },
+            {
+                "from_stop_id": "STOP_B",
+                "to_stop_id": "STOP_UNKNOWN",
+                "duration_sec": 100.0,
+                "observed_at_utc": observed_at,
+            },
+        ],
+    }
+
+    response = client.post(
+        "/v1/ride_summary",
+        json=ride_data,
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+    _, conn = temp_db
+    cursor = conn.cursor()
+    rides = cursor.execute("SELECT COUNT(*) FROM rides").fetchone()[0]
+    learned = cursor.execute("SELECT COUNT(*) FROM segment_stats WHERE n > 0").fetchone()[0]
+    buckets = cursor.execute(
+        "SELECT COUNT(*) FROM device_buckets WHERE bucket_id = ?", (bucket,)
+    ).fetchone()[0]
+
+    assert (rides, learned, buckets) == (0, 0, 0)
+
+
+def test_holiday_flag_routing(client, auth_headers, seeded_segment):
     """Test that is_holiday routes weekday to weekend bins."""
-    setup_test_segment(client)
     from app.db import compute_bin_id
 
     # Create a recent Monday 9:00 AM IST timestamp (within 7-day validation window)
@@ -212,10 +250,8 @@ def test_holiday_flag_routing(client, auth_headers):
     assert response.status_code == 200
 
 
-def test_low_n_warning_in_eta(client):
+def test_low_n_warning_in_eta(client, seeded_segment):
     """Test that low_confidence is returned when n < 8."""
-    setup_test_segment(client)
-
     # Query ETA for a bin with low n
     response = client.get(
         "/v1/eta",
@@ -252,3 +288,16 @@ def test_timezone_bin_mapping():
     dt = datetime(2025, 10, 18, 10, 0, 0, tzinfo=tz)
     bin_id = compute_bin_id(int(dt.timestamp()))
     assert bin_id == 136  # weekday_type=1, hour=10, minute_slot=0 -> 96 + 40
+
+
+def test_bin_mapping_at_slot_boundaries():
+    """Test that a whole 15-minute slot maps to one bin and the next second does not."""
+    from app.db import compute_bin_id
+
+    tz = ZoneInfo("Asia/Kolkata")
+
+    # Friday 23:45 IST is the last weekday bin; Saturday 00:00 the first weekend bin
+    start = int(datetime(2025, 10, 17, 23, 45, 0, tzinfo=tz).timestamp())
+    assert compute_bin_id(start) == 95
+    assert compute_bin_id(start + 899) == 95
+    assert compute_bin_id(start + 900) == 96
@@ -47,7 +47,7 @@ def rate_limit_client(temp_db, rate_limit_env):
 
 
 @pytest.fixture
-def setup_rate_limit_segment(rate_limit_client):
+def setup_rate_limit_segment(rate_limit_client, get_or_create_segment):
     """Setup test segment for rate limit tests."""
     from app.config import get_settings
     from app.db import get_connection
@@ -57,18 +57,7 @@ def setup_rate_limit_segment(rate_limit_client):
     cursor = conn.cursor()
 
     # Insert test segment
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    conn.commit()
-
-    # Get segment_id and insert baseline stats
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
+    segment_id = get_or_create_segment(conn, "ROUTE1", 0, "STOP_A", "STOP_B")
 
     # Insert baseline stats for bin 0
     cursor.execute(
@@ -354,7 +343,7 @@ def test_idempotency_does_not_spend_tokens(setup_rate_limit_segment, auth_header
     assert remaining_after_second >= remaining_after_first
 
 
-def test_feature_flag_disabled(client, auth_headers):
+def test_feature_flag_disabled(client, auth_headers, get_or_create_segment):
     """Test rate limiting bypassed when feature flag disabled.
 
     Note: This test uses the regular client fixture which has rate limiting disabled by default.
@@ -369,15 +358,7 @@ def test_feature_flag_disabled(client, auth_headers):
     from app.db import get_connection
     conn = get_connection(settings.db_path)
     cursor = conn.cursor()
-    cursor.execute(
-        "INSERT OR IGNORE INTO segments (route_id, direction_id, from_stop_id, to_stop_id) VALUES (?, ?, ?, ?)",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    cursor.execute(
-        "SELECT segment_id FROM segments WHERE route_id=? AND direction_id=? AND from_stop_id=? AND to_stop_id=?",
-        ("ROUTE1", 0, "STOP_A", "STOP_B"),
-    )
-    segment_id = cursor.fetchone()[0]
+    segment_id = get_or_create_segment(conn, "ROUTE1", 0, "STOP_A", "STOP_B")
     cursor.execute(
         "INSERT OR IGNORE INTO segment_stats (segment_id, bin_id, schedule_mean) VALUES (?, 0, 300.0)",
         (segment_id,),
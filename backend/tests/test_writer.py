@@ -0,0 +1,169 @@
+"""Unit tests for the group-commit writer.
+
+Uses isolated fixtures from conftest.py.
+"""
+
+import asyncio
+
+import pytest
+
+# Mark all tests in this module as unit tests
+pytestmark = pytest.mark.unit
+
+
+def _insert_ride(segment_count: int):
+    """Build a write job inserting one rides row."""
+
+    def job(conn):
+        cursor = conn.execute(
+            "INSERT INTO rides (submitted_at, segment_count) VALUES (?, ?)",
+            (0, segment_count),
+        )
+        return cursor.lastrowid
+
+    return job
+
+
+def _failing_job(conn):
+    conn.execute("INSERT INTO rides (submitted_at, segment_count) VALUES (0, 99)")
+    raise ValueError("boom")
+
+
+def _ride_counts(db_path: str) -> list[int]:
+    from app.db import get_connection
+
+    conn = get_connection(db_path)
+    rows = conn.execute("SELECT segment_count FROM rides ORDER BY ride_id").fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+def test_write_batch_isolates_failing_job(temp_db):
+    """Test that a failing job is rolled back without affecting its batch."""
+    from app.writer import write_batch
+
+    db_path, _ = temp_db
+    outcomes = write_batch(db_path, [_insert_ride(1), _failing_job, _insert_ride(2)])
+
+    assert outcomes[0][1] is None
+    assert isinstance(outcomes[1][1], ValueError)
+    assert outcomes[2][1] is None
+    assert _ride_counts(db_path) == [1, 2]
+
+
+def test_writer_batches_concurrent_submissions(temp_db, monkeypatch):
+    """Test that concurrent submissions share one group commit."""
+    import app.writer
+    from app.writer import GroupCommitWriter, write_batch
+
+    db_path, _ = temp_db
+    batch_sizes = []
+
+    def recording_write_batch(path, jobs):
+        batch_sizes.append(len(jobs))
+        return write_batch(path, jobs)
+
+    monkeypatch.setattr(app.writer, "write_batch", recording_write_batch)
+
+    async def scenario():
+        writer = GroupCommitWriter()
+        writer.start()
+        try:
+            return await asyncio.gather(
+                *(writer.submit(db_path, _insert_ride(i)) for i in range(5))
+            )
+        finally:
+            await writer.stop()
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(ride_id, int) for ride_id in results)
+    assert batch_sizes == [5]
+    assert sorted(_ride_counts(db_path)) == [0, 1, 2, 3, 4]
+
+
+def test_writer_reraises_job_exception(temp_db):
+    """Test that a job's exception surfaces in the awaiting caller."""
+    from app.writer import GroupCommitWriter
+
+    db_path, _ = temp_db
+
+    async def scenario():
+        writer = GroupCommitWriter()
+        writer.start()
+        try:
+            with pytest.raises(ValueError):
+                await writer.submit(db_path, _failing_job)
+        finally:
+            await writer.stop()
+
+    asyncio.run(scenario())
+    assert _ride_counts(db_path) == []
+
+
+def test_writer_runs_inline_when_not_started(temp_db):
+    """Test the single-job fallback used without the app lifespan."""
+    from app.writer import GroupCommitWriter
+
+    db_path, _ = temp_db
+    ride_id = asyncio.run(GroupCommitWriter().submit(db_path, _insert_ride(7)))
+
+    assert ride_id == 1
+    assert _ride_counts(db_path) == [7]
+
+
+def test_idempotency_check_sees_key_stored_earlier_in_batch(temp_db):
+    """Test that check-then-store is serialized for jobs sharing one batch."""
+    from app.idempotency import check_idempotency_key, store_idempotency_key
+    from app.writer import write_batch
+
+    db_path, _ = temp_db
+    key = "batch-shared-key"
+
+    def submit(body):
+        def job(conn):
+            cached = check_idempotency_key(key, body, conn=conn)
+            if cached is not None:
+                return cached["body_hash_match"]
+            store_idempotency_key(key, body, {"accepted_segments": 1}, conn=conn)
+            return "stored"
+
+        return job
+
+    outcomes = write_batch(
+        db_path, [submit({"route_id": "A"}), submit({"route_id": "B"}), submit({"route_id": "A"})]
+    )
+
+    assert [result for result, _ in outcomes] == ["stored", False, True]
+
+
+def test_writer_fails_pending_jobs_when_task_dies(temp_db, monkeypatch):
+    """Test that jobs queued or in flight fail, not hang, if the writer task dies."""
+    import app.writer
+    from app.writer import GroupCommitWriter
+
+    db_path, _ = temp_db
+
+    def broken_settings():
+        raise RuntimeError("settings unavailable")
+
+    monkeypatch.setattr(app.writer, "get_settings", broken_settings)
+
+    async def scenario():
+        writer = GroupCommitWriter()
+        writer.start()
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(writer.submit(db_path, _insert_ride(i)) for i in range(3)),
+                return_exceptions=True,
+            ),
+            timeout=5,
+        )
+        assert not writer.running
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert _ride_counts(db_path) == []
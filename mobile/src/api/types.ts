@@ -348,4 +348,6 @@ export interface PostRideSummaryResponse {
   rejected_segments: number;
   /** Breakdown of rejection reasons */
   rejected_by_reason: RejectionReasons;
+  /** Device bucket's observation count after this ride (null without device_bucket) */
+  device_bucket_observation_count?: number | null;
 }